@@ -22,7 +22,7 @@ sys.path.insert(0, str(project_root))
 # Import project modules
 from src.utils.config_loader import load_config
 from src.api.semantic_scholar import SemanticScholarAPI
-from src.models.article import Article
+from src.models.article import Article, download_pdfs
 from src.models.post import Post
 from src.models.figure import Figure
 from src.models.supabase import SupabaseDB
@@ -328,9 +328,13 @@ def generate_markdown_post(article, post, figure_urls, post_dir):
                     
                     response = requests.get(thumbnail_url, stream=True, timeout=30)
                     if response.status_code == 200:
-                        with open(thumbnail_path, 'wb') as f:
+                        # The thumbnail may be hard-linked to a figure under data/, so
+                        # replace it rather than writing into the linked file
+                        tmp_path = thumbnail_path.with_suffix(thumbnail_path.suffix + '.tmp')
+                        with open(tmp_path, 'wb') as f:
                             for chunk in response.iter_content(chunk_size=8192):
                                 f.write(chunk)
+                        os.replace(tmp_path, thumbnail_path)
                         logger.info(f"Downloaded thumbnail from R2: {thumbnail_path}")
                 else:
                     # Try to use local thumbnail
@@ -345,6 +349,36 @@ def generate_markdown_post(article, post, figure_urls, post_dir):
         logger.exception("Markdown generation error details:")
         return None
 
+def create_article(paper_data, data_dir):
+    """
+    Create an Article from a paper record in the database.
+    
+    Args:
+        paper_data: Paper record from the database
+        data_dir: Directory holding each paper's data folder
+        
+    Returns:
+        Article for the paper
+    """
+    paper_id = paper_data['id']
+    article = Article(
+        uid=paper_id,
+        title=paper_data.get('title', ''),
+        url=paper_data.get('url', ''),
+        authors=paper_data.get('authors', []),
+        abstract=paper_data.get('abstract', ''),
+        venue=paper_data.get('venue', ''),
+        submitted_date=paper_data.get('submitted_date'),
+        website_content_path=WEBSITE_CONTENT_PATH,
+        data_folder=data_dir / paper_id
+    )
+    
+    # Add TLDR if available
+    if paper_data.get('tldr'):
+        article.set_tldr(paper_data.get('tldr', ''))
+    
+    return article
+
 def process_papers(paper_id=None, limit=5, skip_figures=False, 
                   skip_summary=False, skip_markdown=False, db=None):
     """
@@ -411,34 +445,24 @@ def process_papers(paper_id=None, limit=5, skip_figures=False,
         logger.info("No papers found to process")
         return []
     
+    # Set data folder
+    data_dir = Path(config.get('data_dir', 'data'))
+    data_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Create the Article objects once, so the PDF prefetch and the loop below share them
+    articles = [create_article(paper_data, data_dir) for paper_data in papers_to_process]
+    
+    # Fetch all PDFs concurrently up front; download_pdf below then finds them on disk
+    if not skip_summary:
+        download_pdfs(articles)
+    
     # Process each paper
     successfully_processed = []
-    for paper_data in papers_to_process:
+    for paper_data, article in zip(papers_to_process, articles):
         paper_id = paper_data['id']
         logger.info(f"Processing paper: {paper_data['title']} (ID: {paper_id})")
         
         try:
-            # Set data folder
-            data_dir = Path(config.get('data_dir', 'data'))
-            data_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Create Article object
-            article = Article(
-                uid=paper_id,
-                title=paper_data.get('title', ''),
-                url=paper_data.get('url', ''),
-                authors=paper_data.get('authors', []),
-                abstract=paper_data.get('abstract', ''),
-                venue=paper_data.get('venue', ''),
-                submitted_date=paper_data.get('submitted_date'),
-                website_content_path=WEBSITE_CONTENT_PATH,
-                data_folder=data_dir / paper_id
-            )
-            
-            # Add TLDR if available
-            if paper_data.get('tldr'):
-                article.set_tldr(paper_data.get('tldr', ''))
-            
             # Create post folder
             post = Post(article)
             post_dir = post.post_dir
@@ -612,21 +636,7 @@ def reprocess_papers_with_incomplete_data(paper_id=None, limit=5, skip_figures=F
             data_dir.mkdir(parents=True, exist_ok=True)
             
             # Create Article object
-            article = Article(
-                uid=paper_id,
-                title=paper_data.get('title', ''),
-                url=paper_data.get('url', ''),
-                authors=paper_data.get('authors', []),
-                abstract=paper_data.get('abstract', ''),
-                venue=paper_data.get('venue', ''),
-                submitted_date=paper_data.get('submitted_date'),
-                website_content_path=WEBSITE_CONTENT_PATH,
-                data_folder=data_dir / paper_id
-            )
-            
-            # Add TLDR if available
-            if paper_data.get('tldr'):
-                article.set_tldr(paper_data.get('tldr', ''))
+            article = create_article(paper_data, data_dir)
             
             # Create post folder
             post = Post(article)
@@ -4,9 +4,9 @@ from typing import List, Optional, Dict, Any
 import logging
 from pathlib import Path
 import os
-import json
 
 from src.models.supabase import SupabaseDB
+from src.utils.json_utils import read_json_cached
 from src.api.schemas import PaperSummary, PaperDetail, FigureSchema
 
 # Initialize router
@@ -109,21 +109,19 @@ def _get_figure_with_parent_info(db: SupabaseDB, paper_id: str, fig_data: dict)
                 alt_meta_path = data_dir / paper_id / "figures" / "figures.json"
                 
                 if meta_path.exists():
-                    with open(meta_path, 'r') as f:
-                        figures_meta = json.load(f)
-                        parent_fig_key = f"fig{main_num}"
-                        if parent_fig_key in figures_meta:
-                            parent_caption = figures_meta[parent_fig_key].get('caption', '')
-                            has_subfigures = figures_meta[parent_fig_key].get('has_subfigures', False)
-                            subfigures = figures_meta[parent_fig_key].get('subfigures', [])
+                    figures_meta = read_json_cached(meta_path)
+                    parent_fig_key = f"fig{main_num}"
+                    if parent_fig_key in figures_meta:
+                        parent_caption = figures_meta[parent_fig_key].get('caption', '')
+                        has_subfigures = figures_meta[parent_fig_key].get('has_subfigures', False)
+                        subfigures = figures_meta[parent_fig_key].get('subfigures', [])
                 elif alt_meta_path.exists():
-                    with open(alt_meta_path, 'r') as f:
-                        figures_meta = json.load(f)
-                        parent_fig_key = f"fig{main_num}"
-                        if parent_fig_key in figures_meta:
-                            parent_caption = figures_meta[parent_fig_key].get('caption', '')
-                            has_subfigures = figures_meta[parent_fig_key].get('has_subfigures', False)
-                            subfigures = figures_meta[parent_fig_key].get('subfigures', [])
+                    figures_meta = read_json_cached(alt_meta_path)
+                    parent_fig_key = f"fig{main_num}"
+                    if parent_fig_key in figures_meta:
+                        parent_caption = figures_meta[parent_fig_key].get('caption', '')
+                        has_subfigures = figures_meta[parent_fig_key].get('has_subfigures', False)
+                        subfigures = figures_meta[parent_fig_key].get('subfigures', [])
             except Exception as e:
                 logger.warning(f"Error getting parent figure metadata: {e}")
                 
@@ -145,19 +143,17 @@ def _get_figure_with_parent_info(db: SupabaseDB, paper_id: str, fig_data: dict)
             alt_meta_path = data_dir / paper_id / "figures" / "figures.json"
             
             if meta_path.exists():
-                with open(meta_path, 'r') as f:
-                    figures_meta = json.load(f)
-                    fig_key = f"fig{fig_id}"
-                    if fig_key in figures_meta:
-                        has_subfigures = figures_meta[fig_key].get('has_subfigures', False)
-                        subfigures = figures_meta[fig_key].get('subfigures', [])
+                figures_meta = read_json_cached(meta_path)
+                fig_key = f"fig{fig_id}"
+                if fig_key in figures_meta:
+                    has_subfigures = figures_meta[fig_key].get('has_subfigures', False)
+                    subfigures = figures_meta[fig_key].get('subfigures', [])
             elif alt_meta_path.exists():
-                with open(alt_meta_path, 'r') as f:
-                    figures_meta = json.load(f)
-                    fig_key = f"fig{fig_id}"
-                    if fig_key in figures_meta:
-                        has_subfigures = figures_meta[fig_key].get('has_subfigures', False)
-                        subfigures = figures_meta[fig_key].get('subfigures', [])
+                figures_meta = read_json_cached(alt_meta_path)
+                fig_key = f"fig{fig_id}"
+                if fig_key in figures_meta:
+                    has_subfigures = figures_meta[fig_key].get('has_subfigures', False)
+                    subfigures = figures_meta[fig_key].get('subfigures', [])
         except Exception as e:
             logger.warning(f"Error getting figure metadata: {e}")
     
@@ -464,9 +460,8 @@ async def get_figure(paper_id: str, figure_id: str, db: SupabaseDB = Depends(get
                 meta_path = data_dir / paper_id / "figures" / "figures.json"
                 if meta_path.exists():
                     try:
-                        with open(meta_path, 'r') as f:
-                            figures_meta = json.load(f)
-                            caption = figures_meta.get(figure_id, {}).get('caption', '')
+                        figures_meta = read_json_cached(meta_path)
+                        caption = figures_meta.get(figure_id, {}).get('caption', '')
                     except:
                         pass
                 
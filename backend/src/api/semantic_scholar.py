@@ -1,7 +1,7 @@
 import requests
 import logging
 import time
-from typing import List, Dict
+from typing import List, Dict, Optional
 from requests.exceptions import RequestException
 from datetime import datetime, timedelta
 from urllib.parse import urlencode
@@ -10,14 +10,18 @@ class SemanticScholarAPI:
     BASE_URL = "https://api.semanticscholar.org/graph/v1"
     MAX_RETRIES = 5
     INITIAL_BACKOFF = 1  # Initial backoff time in seconds
+    MAX_BATCH_SIZE = 500  # Maximum number of IDs per paper/batch request
 
-    def __init__(self, api_key: str = None, development_mode: bool = False):
+    def __init__(self, api_key: str = None, development_mode: bool = False, session: Optional[requests.Session] = None):
         self.logger = logging.getLogger(__name__)
-        self.session = requests.Session()
+        # Reuse a shared session when given so connections stay alive across clients
+        self.session = session if session is not None else requests.Session()
+        # Keep headers per client, since the session may be shared with other services
+        self.headers = {}
         
         # Set up API key if provided (it's now optional)
         if api_key and api_key not in ["your_semantic_scholar_api_key_here", "${SEMANTIC_SCHOLAR_API_KEY}"]:
-            self.session.headers.update({"x-api-key": api_key})
+            self.headers["x-api-key"] = api_key
             masked_key = f"{api_key[:4]}...{api_key[-4:]}" if len(api_key) > 8 else "****"
             self.logger.debug(f"Initializing SemanticScholarAPI with key: {masked_key}")
         else:
@@ -41,7 +45,7 @@ class SemanticScholarAPI:
         backoff = self.INITIAL_BACKOFF
 
         # Log the request details
-        masked_headers = dict(self.session.headers)
+        masked_headers = dict(self.headers)
         if 'x-api-key' in masked_headers:
             masked_headers['x-api-key'] = f"{masked_headers['x-api-key'][:4]}...{masked_headers['x-api-key'][-4:]}"
         
@@ -73,7 +77,7 @@ class SemanticScholarAPI:
         for attempt in range(self.MAX_RETRIES):
             try:
                 self.logger.debug(f"Attempt {attempt+1}/{self.MAX_RETRIES}")
-                response = self.session.request(method, url, **kwargs)
+                response = self.session.request(method, url, headers=self.headers, **kwargs)
                 # Log the response details
                 self.logger.debug(f"Response status code: {response.status_code}")
                 self.logger.debug(f"Response headers: {dict(response.headers)}")
@@ -303,11 +307,14 @@ class SemanticScholarAPI:
             self.logger.info("Development mode: Returning mock paper details")
             return [self._get_mock_paper_details(paper_id) for paper_id in paper_ids]
         
-        # Normal API flow
+        # Normal API flow, split into the largest batches the endpoint accepts
         params = {
             "fields": "paperId,title,authors,year,abstract,url,venue,publicationDate"
         }
-        data = self._make_request("POST", "paper/batch", json={"ids": paper_ids}, params=params)
+        data = []
+        for start in range(0, len(paper_ids), self.MAX_BATCH_SIZE):
+            batch_ids = paper_ids[start:start + self.MAX_BATCH_SIZE]
+            data.extend(self._make_request("POST", "paper/batch", json={"ids": batch_ids}, params=params))
         self.logger.debug(f"Successfully fetched details for {len(data)} papers")
         return data
         
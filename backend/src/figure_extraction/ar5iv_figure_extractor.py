@@ -13,6 +13,7 @@ import json
 import shutil
 
 from src.models.figure import Figure, FigureExtractor
+from src.utils.file_utils import write_bytes_atomic
 
 logger = logging.getLogger(__name__)
 
@@ -199,8 +200,7 @@ class Ar5ivFigureExtractor(FigureExtractor):
             
             # Decode and save
             img_data = base64.b64decode(base64_data)
-            with open(output_path, 'wb') as f:
-                f.write(img_data)
+            write_bytes_atomic(output_path, img_data)
             
             return True
         except Exception as e:
@@ -213,8 +213,7 @@ class Ar5ivFigureExtractor(FigureExtractor):
             response = requests.get(url, headers=self.headers, timeout=30)
             response.raise_for_status()
             
-            with open(output_path, 'wb') as f:
-                f.write(response.content)
+            write_bytes_atomic(output_path, response.content)
             
             return True
         except Exception as e:
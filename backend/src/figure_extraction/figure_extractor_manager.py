@@ -4,7 +4,7 @@ import re
 from typing import List, Dict, Optional
 from pathlib import Path
 from src.models.figure import Figure 
-from src.models.post import Post
+from src.models.post import Post, mark_figures_complete
 from .ar5iv_figure_extractor import Ar5ivFigureExtractor
 from .pdf_figure_extractor import PdfFigureExtractor
 from src.models.supabase import SupabaseDB
@@ -92,6 +92,7 @@ class FigureExtractorManager:
                         figure.remote_path = fig_data['remote_path']
                         figure.local_path = fig_data['local_path']
                         post.figures[fig_data['figure_id']] = figure
+                    self._mark_complete(post)
                     return True
             except Exception as e:
                 self.logger.warning(f"Error checking Supabase for figures: {e}. Continuing with extraction.")
@@ -99,6 +100,7 @@ class FigureExtractorManager:
         # Check if figures already exist in the post
         if post.figures and not force:
             self.logger.info(f"Figures already exist for post {paper_id}")
+            self._mark_complete(post)
             return True
 
         # Check if figures already exist for the post
@@ -112,6 +114,7 @@ class FigureExtractorManager:
                 post.figures = self.extractors[0].load_metadata(metadata_path, figures_dir)
             else:
                 post.figures = self.extractors[0].load_metadata(alt_metadata_path, figures_dir)
+            self._mark_complete(post)
             return True
         
         # Try ar5iv extractor first
@@ -145,6 +148,17 @@ class FigureExtractorManager:
         
         return success
         
+    def _mark_complete(self, post: Post) -> None:
+        """
+        Mark the post's figures directory as complete when existing figures are reused.
+        
+        Directories extracted before the completion marker existed, or filled from
+        Supabase/R2, would otherwise be sent through extraction again on every run.
+        """
+        figures_dir = post.article.data_folder / "figures"
+        figures_dir.mkdir(parents=True, exist_ok=True)
+        mark_figures_complete(figures_dir)
+        
     def store_figures_in_r2(self, post: Post) -> bool:
         """
         Store extracted figures in Cloudflare R2 via Supabase.
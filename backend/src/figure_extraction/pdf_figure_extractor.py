@@ -15,6 +15,7 @@ from PIL import Image
 import io
 import numpy as np
 from src.models.figure import Figure, FigureExtractor
+from src.utils.file_utils import write_bytes_atomic
 
 logger = logging.getLogger(__name__)
 
@@ -159,8 +160,7 @@ class PdfFigureExtractor(FigureExtractor):
                     
                     # Save the image
                     img_path = output_dir / f"pdf_img_{page_num+1}_{img_idx+1}.png"
-                    with open(img_path, 'wb') as f:
-                        f.write(image_bytes)
+                    write_bytes_atomic(img_path, image_bytes)
                     
                     images.append({
                         'path': img_path,
@@ -196,7 +196,7 @@ class PdfFigureExtractor(FigureExtractor):
                 
                 # Save full page for reference
                 page_path = output_dir / f"pdf_page_{page_num+1}.png"
-                pil_img.save(page_path)
+                write_bytes_atomic(page_path, img_data)
                 
                 # Use full page as an image (as fallback)
                 images.append({
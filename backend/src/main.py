@@ -1,18 +1,24 @@
 import sys
 import os
-import time
 import logging
+import threading
+import signal
+from typing import Optional, Tuple
 from src.utils.config_loader import load_config
+from src.utils.http_session import create_http_session
+from src.utils.file_utils import link_or_copy, write_text_atomic
+from src.utils.json_utils import read_json
 from src.api.semantic_scholar import SemanticScholarAPI
 from src.models.supabase import SupabaseDB
-from datetime import datetime
+from datetime import datetime, date
 import argparse
-from src.summarizer.paper_summarizer import PaperSummarizer
+import requests
+from concurrent.futures import ThreadPoolExecutor
 from src.models.article import Article
-import shutil
+from src.models.post import FIGURES_DONE_MARKER, Post
+from src.figure_extraction import FigureExtractorManager
 from pathlib import Path
 import re
-import json
 from src.markdown.post_generator import create_post_markdown
 
 # Add the project root to the Python path
@@ -25,6 +31,28 @@ DEBUG_MODE = True  # Set this to False to disable debug logs
 # Initialize logger at the top of the file
 logger = logging.getLogger(__name__)
 
+# Semantic Scholar fields copied unchanged into new paper entries, with their defaults
+NEW_PAPER_FIELDS = {
+    'title': '',
+    'year': None,
+    'abstract': '',
+    'url': '',
+    'venue': '',
+    'query': '',
+    'tldr': {},
+    'embedding': {},
+}
+
+# Time between processing cycles when running with --daemon
+CYCLE_INTERVAL_SECONDS = 24 * 60 * 60
+
+# Number of flagged papers prepared (PDF download, figure extraction) in parallel
+FLAGGED_PAPER_WORKERS = 8
+
+# Figure extraction is CPU-heavy, so fewer papers run it at once than download PDFs
+FIGURE_EXTRACTION_WORKERS = 2
+_figure_extraction_slots = threading.BoundedSemaphore(FIGURE_EXTRACTION_WORKERS)
+
 def setup_logging():
     log_level = logging.DEBUG
     logging.basicConfig(level=log_level, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -48,10 +76,16 @@ def main():
     parser.add_argument("--months", type=int, default=1, help="Number of months to look back for papers (default: 1)")
     parser.add_argument("--reprocess", choices=['figures', 'summary', 'markdown', 'info', 'all'], 
                        help="Reprocess specific parts of existing papers: figures, summary, markdown, info (re-query API), or all")
+    parser.add_argument("--force-summary", action="store_true",
+                       help="Regenerate summaries even if the PDF is unchanged since the last summary")
     parser.add_argument("--paper-id", help="Specific paper ID to reprocess (optional)")
     parser.add_argument("--api", action="store_true", help="Run as API server instead of processing pipeline")
+    parser.add_argument("--daemon", action="store_true", help="Keep running and repeat the processing cycle every 24 hours")
     args = parser.parse_args()
     
+    # One pooled session shared by the HTTP API clients for the lifetime of the process
+    http_session = create_http_session()
+    
     try:
         config = load_config()
         logger.debug("Configuration loaded successfully")
@@ -78,7 +112,7 @@ def main():
         if os.environ.get('DEVELOPMENT_MODE') == 'true':
             logger.info("Running in development mode - using mock API clients")
             # Use development/mock API client
-            semantic_scholar_api = SemanticScholarAPI(config['semantic_scholar']['api_key'], development_mode=True)
+            semantic_scholar_api = SemanticScholarAPI(config['semantic_scholar']['api_key'], development_mode=True, session=http_session)
             logger.debug("Mock Semantic Scholar API initialized for development")
             
             # Use mock database client
@@ -90,7 +124,7 @@ def main():
             api_key = config.get('semantic_scholar', {}).get('api_key')
             
             # API key is now optional for Semantic Scholar
-            semantic_scholar_api = SemanticScholarAPI(api_key)
+            semantic_scholar_api = SemanticScholarAPI(api_key, session=http_session)
             logger.debug("Semantic Scholar API initialized")
             
             # Supabase still requires credentials
@@ -103,30 +137,42 @@ def main():
                 db = SupabaseDB()
                 logger.debug("Supabase DB initialized")
 
-        while True:
+        # In daemon mode, stop waiting between cycles as soon as the process is asked to terminate.
+        # A single run keeps the default SIGTERM handling, since nothing checks the event mid-cycle.
+        stop_event = threading.Event()
+        if args.daemon:
+            signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+        
+        while not stop_event.is_set():
             logger.info("Starting new processing cycle")
+            # Pick up papers stored by other processes (API, manage scripts) since the last cycle
+            db.refresh_paper_ids()
+
             # Fetch and process new papers
             process_new_papers(semantic_scholar_api, db, ignore_date_range=args.ignore_date_range, months=args.months)
 
             # Check for manually flagged papers
-            process_flagged_papers(db, args)
+            process_flagged_papers(db, args, config, api=semantic_scholar_api, http_session=http_session)
 
+            # Run a single cycle unless asked to keep running; schedule with cron/systemd instead
+            if not args.daemon:
+                logger.info("Processing cycle completed")
+                break
+            
             logger.info("Processing cycle completed. Waiting for next cycle.")
-            # Wait for the next cycle (e.g., every 24 hours)
-            time.sleep(24 * 60 * 60)
+            stop_event.wait(CYCLE_INTERVAL_SECONDS)
     except Exception as e:
         logger.error(f"An error occurred during initialization: {e}")
         sys.exit(1)
+    finally:
+        http_session.close()
 
 def process_new_papers(api: SemanticScholarAPI, db: SupabaseDB, ignore_date_range: bool = False, months: int = 1):
     logger.info(f"Processing new papers (ignore_date_range: {ignore_date_range}, months: {months})")
     
     # Get existing paper IDs from the database first
-    existing_papers = set()
     try:
-        # For Supabase, get all papers and extract IDs
-        papers = db.get_papers()
-        existing_papers = {paper.uid for paper in papers}
+        existing_papers = db.get_paper_ids()
         logger.debug(f"Found {len(existing_papers)} existing papers in database")
     except Exception as e:
         logger.error(f"Error loading existing papers: {e}")
@@ -137,11 +183,17 @@ def process_new_papers(api: SemanticScholarAPI, db: SupabaseDB, ignore_date_rang
     
     queries = ["AI Safety", "Mechanistic Interpretability"]
     
+    # Fetch all queries concurrently; results are still consumed in query order below
+    with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+        futures = []
+        for query in queries:
+            logger.debug(f"Fetching papers for query: {query}")
+            futures.append(executor.submit(api.get_relevant_papers, query, months=months, limit=100, ignore_date_range=ignore_date_range))
+    
     all_papers = []
-    for query in queries:
+    for query, future in zip(queries, futures):
         try:
-            logger.debug(f"Fetching papers for query: {query}")
-            papers = api.get_relevant_papers(query, months=months, limit=100, ignore_date_range=ignore_date_range)
+            papers = future.result()
             
             # Filter out papers that exist in DB or were already processed in this run
             new_papers = [p for p in papers 
@@ -163,6 +215,7 @@ def process_new_papers(api: SemanticScholarAPI, db: SupabaseDB, ignore_date_rang
         logger.info("No new papers found")
         return
 
+    entries = []
     for paper in all_papers:
         logger.debug(f"Processing paper: {paper['paperId']}")
         try:
@@ -171,24 +224,16 @@ def process_new_papers(api: SemanticScholarAPI, db: SupabaseDB, ignore_date_rang
                 logger.warning("Skipping paper with missing ID")
                 continue
                 
-            # Create entry with the correct ID field
-            entry = {
-                'id': paper['paperId'],
-                'title': paper.get('title', ''),
-                'authors': [author.get('name', '') for author in paper.get('authors', [])],
-                'year': paper.get('year'),
-                'abstract': paper.get('abstract', ''),
-                'url': paper.get('url', ''),
-                'venue': paper.get('venue', ''),
-                'submitted_date': datetime.fromisoformat(paper.get('publicationDate', '').split('T')[0]) 
-                                if paper.get('publicationDate') else None,
-                'query': paper.get('query', ''),
-                'tldr': paper.get('tldr', {}),
-                'embedding': paper.get('embedding', {})
-            }
+            # Create entry with the correct ID field, copying the remaining fields as-is
+            get = paper.get
+            entry = {field: get(field, default) for field, default in NEW_PAPER_FIELDS.items()}
+            entry['id'] = paper['paperId']
+            entry['authors'] = [author.get('name', '') for author in get('authors', [])]
+            # publicationDate is already an ISO "YYYY-MM-DD" date, which the date column accepts as-is
+            publication_date = get('publicationDate')
+            entry['submitted_date'] = publication_date[:10] if publication_date else None
             
-            # Add entry to database
-            db.add_paper(entry)
+            entries.append(entry)
             logger.debug(f"Successfully processed paper: {paper['paperId']}")
             
         except Exception as e:
@@ -196,25 +241,34 @@ def process_new_papers(api: SemanticScholarAPI, db: SupabaseDB, ignore_date_rang
             logger.exception("Full traceback:")
             continue
     
+    # Add all entries to the database in a single request
+    try:
+        added = db.add_papers(entries)
+        logger.debug(f"Added {added} papers to database")
+    except Exception as e:
+        logger.error(f"Failed to add {len(entries)} papers to database: {e}")
+        logger.exception("Full traceback:")
+        return
+    
     logger.debug(f"Processed {len(all_papers)} new papers in total")
 
-def process_flagged_papers(db: SupabaseDB, args):
+def process_flagged_papers(db: SupabaseDB, args, config: dict, api: Optional[SemanticScholarAPI] = None,
+                           http_session: Optional[requests.Session] = None):
     logger.info("Starting process_flagged_papers")
     
     try:
-        logger.debug("Loading config...")
-        config = load_config()
-        
-        # Initialize API if needed for reprocessing info
+        # Use the caller's API client if needed for reprocessing info, creating one only as a fallback
         semantic_scholar_api = None
-        if args.reprocess in ['info', 'all']:
+        if args.reprocess in ['info', 'all'] and api is not None:
+            semantic_scholar_api = api
+        elif args.reprocess in ['info', 'all']:
             # Check if we're in development mode
             if os.environ.get('DEVELOPMENT_MODE') == 'true':
-                semantic_scholar_api = SemanticScholarAPI(config['semantic_scholar']['api_key'], development_mode=True)
+                semantic_scholar_api = SemanticScholarAPI(config['semantic_scholar']['api_key'], development_mode=True, session=http_session)
                 logger.debug("Initialized mock Semantic Scholar API for development")
             else:
                 api_key = config['semantic_scholar']['api_key']
-                semantic_scholar_api = SemanticScholarAPI(api_key)
+                semantic_scholar_api = SemanticScholarAPI(api_key, session=http_session)
                 logger.debug("Initialized Semantic Scholar API for reprocessing")
         
         # Get papers based on command line args
@@ -231,6 +285,16 @@ def process_flagged_papers(db: SupabaseDB, args):
             
         logger.debug(f"Found {len(papers_to_post)} papers to process")
         
+        # Re-query paper info for all papers with a single batch request
+        refreshed_info = {}
+        if semantic_scholar_api and papers_to_post:
+            paper_ids = [get_paper_id(paper) for paper in papers_to_post]
+            try:
+                logger.debug(f"Re-querying API for {len(paper_ids)} papers")
+                refreshed_info = dict(zip(paper_ids, semantic_scholar_api.fetch_paper_details_batch(paper_ids)))
+            except Exception as e:
+                logger.error(f"Failed to re-query paper info: {e}")
+        
         logger.debug("Setting up website content path...")
         website_content_path = Path(config.get('website', {}).get('content_path', '../ai-safety-site/content/en'))
         logger.debug(f"Using website content path: {website_content_path}")
@@ -239,75 +303,56 @@ def process_flagged_papers(db: SupabaseDB, args):
         logger.debug(f"Creating posts directory at: {posts_path}")
         posts_path.mkdir(parents=True, exist_ok=True)
         
-        logger.debug("Initializing PaperSummarizer...")
-        # In development mode, use a mock summarizer
-        if os.environ.get('DEVELOPMENT_MODE') == 'true':
-            summarizer = PaperSummarizer(config['anthropic']['api_key'], development_mode=True)
-            logger.debug("Mock PaperSummarizer initialized for development")
+        # One figure extractor shared by all papers; extraction is throttled by _figure_extraction_slots
+        figure_extractor = FigureExtractorManager()
+        
+        # Prepare papers (info, PDF and figures) concurrently since each step is IO-bound,
+        # keeping results in their original order
+        with ThreadPoolExecutor(max_workers=FLAGGED_PAPER_WORKERS) as executor:
+            futures = [
+                executor.submit(prepare_flagged_paper, paper, i, len(papers_to_post), args, config, db,
+                                refreshed_info.get(get_paper_id(paper)), http_session, figure_extractor)
+                for i, paper in enumerate(papers_to_post)
+            ]
+        # Each entry is (article, needs_summary, regenerate), or None if the paper was skipped
+        prepared = [result for result in (future.result() for future in futures) if result]
+        
+        # Summarize the papers that need it once all are prepared, a few model calls at a time
+        to_summarize = [article for article, needs_summary, _ in prepared if needs_summary]
+        regenerate_uids = {article.uid for article, needs_summary, regenerate in prepared if needs_summary and regenerate}
+        if to_summarize:
+            # Imported here since the summarizer pulls in the LLM client libraries,
+            # which most cycles (no flagged papers, or summaries cached) never need
+            from src.summarizer.paper_summarizer import PaperSummarizer
+            
+            logger.debug("Initializing PaperSummarizer...")
+            # In development mode, use a mock summarizer
+            if os.environ.get('DEVELOPMENT_MODE') == 'true':
+                summarizer = PaperSummarizer(config['anthropic']['api_key'], development_mode=True, db=db)
+                logger.debug("Mock PaperSummarizer initialized for development")
+            else:
+                summarizer = PaperSummarizer(config['anthropic']['api_key'], db=db)
+                logger.debug("PaperSummarizer initialized successfully")
+            
+            logger.debug(f"Generating summaries for {len(to_summarize)} papers...")
+            summaries = summarizer.summarize_many(to_summarize, regenerate_uids=regenerate_uids)
         else:
-            summarizer = PaperSummarizer(config['anthropic']['api_key'])
-            logger.debug("PaperSummarizer initialized successfully")
+            summaries = {}
         
-        for i, paper in enumerate(papers_to_post):
-            paper_id = paper.uid if hasattr(paper, 'uid') else getattr(paper, 'id', 'unknown id')
-            logger.info(f"Processing paper {i+1}/{len(papers_to_post)}: {paper_id}")
+        # Use one date for every post created in this run
+        today = datetime.now().date()
+        posted_ids = []
+        for article, needs_summary, _ in prepared:
             try:
-                # Reprocess paper info if requested
-                if args.reprocess in ['info', 'all']:
-                    try:
-                        logger.debug(f"Re-querying API for paper {paper_id}")
-                        updated_info = semantic_scholar_api.fetch_paper_details_batch([paper_id])[0]
-                        if updated_info:
-                            # Create paper data dictionary for updating
-                            paper_data = {
-                                'id': paper_id,
-                                'title': updated_info.get('title', paper.title if hasattr(paper, 'title') else ''),
-                                'authors': [a.get('name', '') for a in updated_info.get('authors', [])],
-                                'year': updated_info.get('year'),
-                                'abstract': updated_info.get('abstract', paper.abstract if hasattr(paper, 'abstract') else ''),
-                                'url': updated_info.get('url', paper.url if hasattr(paper, 'url') else ''),
-                                'venue': updated_info.get('venue', paper.venue if hasattr(paper, 'venue') else ''),
-                                'tldr': updated_info.get('tldr', paper.tldr if hasattr(paper, 'tldr') else ''),
-                            }
-                            # Update the database entry
-                            db.update_paper(paper_data)
-                            logger.info(f"Updated paper info for {paper_id}")
-                    except Exception as e:
-                        logger.error(f"Failed to update paper info for {paper_id}: {e}")
-                
-                # We may already have an Article instance
-                if isinstance(paper, Article):
-                    article = paper
-                else:
-                    # Create article instance from dictionary or data object
-                    article = create_article_instance(paper)
-                
-                # Set up data paths
-                paper_dir = Path(config['data_dir']) / article.uid
-                pdf_path = paper_dir / "paper.pdf"
-                article.set_data_paths(paper_dir, pdf_path)
-                
-                # Only download PDF if needed
-                if not pdf_path.exists() or args.reprocess == 'all':
-                    if not article.download_pdf():
-                        logger.error(f"Skipping paper {article.uid} due to PDF download failure")
+                if needs_summary:
+                    if article.uid not in summaries:
+                        logger.error(f"Skipping paper {article.uid} due to summary generation failure")
                         continue
-                
-                # Process figures if requested or needed
-                if args.reprocess in ['figures', 'all'] or not (paper_dir / "figures").exists():
-                    if not article.process_figures():
-                        logger.error(f"Skipping paper {article.uid} due to figure processing failure")
-                        continue
-                
-                # Generate summary if requested or needed
-                summary_path = paper_dir / "summary.json"
-                if args.reprocess in ['summary', 'all'] or not summary_path.exists():
-                    logger.debug("Generating summary...")
-                    summary, display_figures, thumbnail_figure = summarizer.summarize(article)
+                    summary, display_figures, thumbnail_figure = summaries[article.uid]
                 else:
                     # Load existing summary
-                    with open(summary_path, 'r', encoding='utf-8') as f:
-                        summary_data = json.load(f)
+                    summary_path = article.data_folder / "summary.json"
+                    summary_data = read_json(summary_path)
                     summary = summary_data['summary']
                     display_figures = summary_data['display_figures']
                     thumbnail_figure = summary_data.get('thumbnail_figure')
@@ -316,43 +361,165 @@ def process_flagged_papers(db: SupabaseDB, args):
                 internal_display_figures = [f"fig_0_{num}" for num in display_figures]
                 article.set_displayed_figures(internal_display_figures)
                 
-                # Set thumbnail source
-                if thumbnail_figure and str(thumbnail_figure).isdigit():
-                    for fig_id in article.figures:
-                        if fig_id.startswith(f"fig_0_{thumbnail_figure}_"):
-                            label_match = re.search(r'_(fig\d+|tab\d+|unk)$', fig_id)
-                            if label_match:
-                                article.set_thumbnail_source(label_match.group(1))
-                                break
-                    else:
-                        logger.warning(f"No matching figure found for thumbnail {thumbnail_figure}, using 'full' mode")
-                        article.set_thumbnail_source('full')
-                else:
-                    article.set_thumbnail_source('full')
+                # Set thumbnail source, falling back to 'full' mode if the figure isn't known
+                thumbnail_label = article.get_figure_label(thumbnail_figure) if thumbnail_figure else None
+                if thumbnail_figure and not thumbnail_label:
+                    logger.warning(f"No matching figure found for thumbnail {thumbnail_figure}, using 'full' mode")
+                article.set_thumbnail_source(thumbnail_label or 'full')
                 
                 # Create website post if requested or needed
                 post_dir = posts_path / f"paper_{article.uid}"
                 if args.reprocess in ['markdown', 'all'] or not post_dir.exists():
-                    create_website_post(article, summary, posts_path)
+                    create_website_post(article, summary, posts_path, today=today)
                 
                 # Only mark as posted if this is a new paper
                 if not args.reprocess:
-                    db.mark_as_posted(article.uid)
+                    posted_ids.append(article.uid)
                     
                 logger.info(f"Successfully processed paper: {article.uid}")
                 
             except Exception as e:
-                logger.error(f"Error processing paper {paper_id}: {e}")
+                logger.error(f"Error processing paper {article.uid}: {e}")
                 logger.exception("Full traceback:")
                 continue
+        
+        db.mark_papers_as_posted(posted_ids)
                 
     except Exception as e:
         logger.error(f"Error during flagged papers processing: {str(e)}")
-        logger.error(f"Config keys available: {list(config.keys()) if 'config' in locals() else 'No config loaded'}")
+        logger.error(f"Config keys available: {list(config.keys())}")
         logger.exception("Full traceback:")
     
     logger.info("Finished process_flagged_papers")
 
+def get_paper_id(paper) -> str:
+    """Get the ID of a paper given as an Article or a database dict."""
+    if isinstance(paper, dict):
+        return paper.get('id', 'unknown id')
+    return paper.uid if hasattr(paper, 'uid') else getattr(paper, 'id', 'unknown id')
+
+def prepare_flagged_paper(paper, index: int, total: int, args, config: dict, db: SupabaseDB,
+                          updated_info: Optional[dict] = None,
+                          http_session: Optional[requests.Session] = None,
+                          figure_extractor: Optional[FigureExtractorManager] = None):
+    """
+    Refresh paper info, download the PDF and extract figures for a flagged paper.
+    
+    Args:
+        updated_info: Paper details re-queried from Semantic Scholar, if any
+        figure_extractor: Extractor shared across papers; one is created if not given
+    
+    Returns:
+        Tuple of (article, needs_summary, regenerate) as described in plan_summary(),
+        or None if the paper should be skipped
+    """
+    paper_id = get_paper_id(paper)
+    logger.info(f"Processing paper {index+1}/{total}: {paper_id}")
+    try:
+        # Reprocess paper info if requested
+        if args.reprocess in ['info', 'all']:
+            try:
+                if updated_info:
+                    # Only send the columns refreshed from the API
+                    paper_fields = {
+                        'title': updated_info.get('title', paper.title if hasattr(paper, 'title') else ''),
+                        'authors': [a.get('name', '') for a in updated_info.get('authors', [])],
+                        'year': updated_info.get('year'),
+                        'abstract': updated_info.get('abstract', paper.abstract if hasattr(paper, 'abstract') else ''),
+                        'url': updated_info.get('url', paper.url if hasattr(paper, 'url') else ''),
+                        'venue': updated_info.get('venue', paper.venue if hasattr(paper, 'venue') else ''),
+                        'tldr': updated_info.get('tldr', paper.tldr if hasattr(paper, 'tldr') else ''),
+                    }
+                    # Update the database entry
+                    db.update_paper_fields(paper_id, paper_fields)
+                    logger.info(f"Updated paper info for {paper_id}")
+            except Exception as e:
+                logger.error(f"Failed to update paper info for {paper_id}: {e}")
+        
+        # We may already have an Article instance
+        if isinstance(paper, Article):
+            article = paper
+        else:
+            # Create article instance from dictionary or data object
+            article = create_article_instance(paper)
+        
+        # Set up data paths
+        paper_dir = Path(config['data_dir']) / article.uid
+        pdf_path = paper_dir / "paper.pdf"
+        article.set_data_paths(paper_dir, pdf_path)
+        
+        # Only download PDF if needed
+        if not pdf_path.exists() or args.reprocess == 'all':
+            if not article.download_pdf(session=http_session):
+                logger.error(f"Skipping paper {article.uid} due to PDF download failure")
+                return None
+        
+        # Process figures if requested or if a previous extraction never completed
+        if args.reprocess in ['figures', 'all'] or not (paper_dir / "figures" / FIGURES_DONE_MARKER).exists():
+            figure_extractor = figure_extractor or FigureExtractorManager()
+            with _figure_extraction_slots:
+                figures_ok = figure_extractor.extract_figures(Post(article), force=args.reprocess in ['figures', 'all'])
+            if not figures_ok:
+                logger.error(f"Skipping paper {article.uid} due to figure processing failure")
+                return None
+        
+        # Generate summary if requested or needed
+        summary_path = paper_dir / "summary.json"
+        needs_summary, regenerate = plan_summary(summary_path, article, args)
+        return article, needs_summary, regenerate
+        
+    except Exception as e:
+        logger.error(f"Error processing paper {paper_id}: {e}")
+        logger.exception("Full traceback:")
+        return None
+
+def plan_summary(summary_path: Path, article: Article, args) -> Tuple[bool, bool]:
+    """
+    Decide whether a flagged paper needs a new summary.
+    
+    A saved summary generated from the current PDF is reused. One generated from a
+    different PDF is stale, so stored summaries (local or in Supabase) are skipped
+    and the paper is summarized again.
+    
+    Returns:
+        Tuple of (needs_summary, regenerate), where regenerate means existing
+        summaries must be ignored rather than reused
+    """
+    needs_summary = args.reprocess in ['summary', 'all'] or not summary_path.exists()
+    if not needs_summary:
+        return False, False
+    if args.force_summary:
+        return True, True
+    if not summary_path.exists():
+        return True, False
+    
+    matches = summary_matches_pdf(summary_path, article)
+    if matches:
+        logger.info(f"PDF unchanged since last summary for {article.uid}, reusing saved summary")
+        return False, False
+    if matches is False:
+        logger.info(f"PDF changed since last summary for {article.uid}, regenerating it")
+        return True, True
+    # Summaries saved without a PDF hash can't be compared, so stored summaries are still used
+    return True, False
+
+def summary_matches_pdf(summary_path: Path, article: Article) -> Optional[bool]:
+    """
+    Check whether a saved summary was generated from the article's current PDF.
+    
+    Returns:
+        True if the PDF is unchanged, False if it changed, or None if the saved
+        summary records no PDF hash or can't be compared
+    """
+    try:
+        saved_hash = read_json(summary_path).get('pdf_sha256')
+        if saved_hash is None:
+            return None
+        return saved_hash == article.get_pdf_sha256()
+    except Exception as e:
+        logger.warning(f"Could not compare summary {summary_path} with the PDF for {article.uid}: {e}")
+        return None
+
 def create_article_instance(paper: dict) -> Article:
     """Create and initialize an Article instance from paper data."""
     article = Article(paper['id'], paper['title'], paper['url'])
@@ -377,7 +544,7 @@ def create_article_instance(paper: dict) -> Article:
     
     return article
 
-def create_website_post(article: Article, summary: str, posts_path: Path):
+def create_website_post(article: Article, summary: str, posts_path: Path, today: Optional[date] = None):
     """Create a new post in the website's content directory."""
     logger = logging.getLogger(__name__)
     
@@ -390,7 +557,7 @@ def create_website_post(article: Article, summary: str, posts_path: Path):
     thumbnail = article.create_thumbnail()
     if thumbnail and thumbnail.exists():
         logger.debug(f"Copying thumbnail to post directory: {thumbnail}")
-        shutil.copy2(thumbnail, post_dir / "thumbnail.png")
+        link_or_copy(thumbnail, post_dir / "thumbnail.png")
     else:
         logger.warning(f"No thumbnail found for article {article.uid}")
     
@@ -409,50 +576,49 @@ def create_website_post(article: Article, summary: str, posts_path: Path):
     post.figures = figures
     
     # Create markdown post with updated figure references
-    post_content = create_post_markdown(post)
+    post_content = create_post_markdown(post, today=today)
     markdown_path = post_dir / "index.md"
     logger.debug(f"Writing markdown content to {markdown_path}")
-    with open(markdown_path, "w", encoding="utf-8") as f:
-        f.write(post_content)
+    write_text_atomic(markdown_path, post_content)
     
     logger.debug(f"Created website post for paper {article.uid}")
 
+# Patterns used by clean_latex, compiled once. The LaTeX fixes share one alternation
+# so they are applied in a single scan; the named group that matched picks the rewrite.
+_LATEX_FIX_RE = re.compile(
+    r'\\(?:bm|1m)\{(?P<mathbf>[^}]+)\}'            # \bm{x} and ar5iv's \1m{x}
+    r'|subscript(?P<subscript>[^}]+)}'
+    r'|superscript(?P<superscript>[^}]+)}'
+    r'|\\operatorname\*?\{(?P<operatorname>[^}]+)\}'
+)
+_LATEX_FIX_TEMPLATES = {
+    'mathbf': '\\mathbf{{{}}}',
+    'subscript': '_{{{}}}',
+    'superscript': '^{{{}}}',
+    'operatorname': '\\operatorname{{{}}}',
+}
+_INLINE_MATH_RE = re.compile(r'([^$])\$([^$])')
+_DISPLAY_MATH_RE = re.compile(r'\$\$')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+def _fix_latex_match(match: re.Match) -> str:
+    """Rewrite a single _LATEX_FIX_RE match."""
+    return _LATEX_FIX_TEMPLATES[match.lastgroup].format(match.group(match.lastgroup))
+
 def clean_latex(text: str) -> str:
     """Clean and convert LaTeX to proper format for Hugo/KaTeX."""
     if not text:
         return text
         
-    # Fix common LaTeX formatting issues
-    text = re.sub(r'\\bm\{([^}]+)\}', r'\\mathbf{\1}', text)  # Convert \bm to \mathbf
-    text = re.sub(r'\\1m\{([^}]+)\}', r'\\mathbf{\1}', text)  # Fix ar5iv-specific formatting
-    
-    # Fix subscript and superscript formatting
-    text = re.sub(r'subscript([^}]+)}', r'_{\1}', text)
-    text = re.sub(r'superscript([^}]+)}', r'^{\1}', text)
-    
-    # Fix operator formatting
-    text = re.sub(r'\\operatorname\*?\{([^}]+)\}', r'\\operatorname{\1}', text)
+    # Fix common LaTeX formatting issues (\bm -> \mathbf, subscripts, superscripts, operators)
+    text = _LATEX_FIX_RE.sub(_fix_latex_match, text)
     
     # Ensure proper spacing around math delimiters
-    text = re.sub(r'([^$])\$([^$])', r'\1 $\2', text)  # Add space around inline math
-    text = re.sub(r'\$\$', r' $$ ', text)  # Add space around display math
+    text = _INLINE_MATH_RE.sub(r'\1 $\2', text)  # Add space around inline math
+    text = _DISPLAY_MATH_RE.sub(r' $$ ', text)  # Add space around display math
     
     # Remove any duplicate spaces
-    text = re.sub(r'\s+', ' ', text)
-    
-    return text
-
-def escape_yaml(text: str) -> str:
-    """Escape text for YAML frontmatter."""
-    if not text:
-        return ""
-    
-    # Only escape quotes and backslashes
-    text = text.replace('\\', '\\\\')  # escape backslashes first
-    text = text.replace('"', '\\"')    # escape quotes
-    
-    # Remove any accidental double escapes
-    text = text.replace('\\\\\\', '\\\\')
+    text = _WHITESPACE_RE.sub(' ', text)
     
     return text
 
@@ -1,48 +1,88 @@
+"""
+Hugo post markdown generation for summarized papers.
+
+The work here is string and regex processing, which Numba/Cython can't speed up.
+Keep the hot paths on the standard library fast paths instead: one-pass regex
+substitution for figure references, str.translate for escaping, and list joins
+for assembling the post.
+"""
 import re
 import logging
+import functools
 import shutil
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, date
+from typing import Optional
 import json
+import yaml
 from backend.src.models.article import Article
 from backend.src.models.post import Post
 from backend.src.models.figure import Figure
 
 logger = logging.getLogger(__name__)
 
-def escape_yaml(text: str) -> str:
-    """Escape text for YAML frontmatter."""
-    if not text:
-        return ""
-    
-    # Only escape quotes and backslashes
-    text = text.replace('\\', '\\\\')  # escape backslashes first
-    text = text.replace('"', '\\"')    # escape quotes
-    
-    # Remove any accidental double escapes
-    text = text.replace('\\\\\\', '\\\\')
-    
-    return text
+# Translation table for escaping shortcode captions once unescaped quotes are replaced
+_CAPTION_TRANS = str.maketrans({'\\': '\\\\', '`': '\\\\`', '$': '\\$'})
+
+# Precompiled patterns used on every post
+_UNESCAPED_QUOTE_RE = re.compile(r'(?<!\\)"')
+# Characters escape_caption rewrites: quotes, backticks, backslashes, dollars and line breaks
+_CAPTION_SPECIAL_RE = re.compile('["`\\\\$\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]')
+_ELEM_NUMBER_RE = re.compile(r'(?:appendix_)?(?:fig|tab)(\d+)')
+# Figure reference, e.g. <FIGURE_ID>3</FIGURE_ID> or <FIGURE_ID>3.b</FIGURE_ID>
+_FIGURE_ID_RE = re.compile(r'<FIGURE_ID>(\d+)(?:\.([a-zA-Z]))?</FIGURE_ID>')
+# Body cleanup: runs of blank lines, or a numbered point such as "2. "
+_CLEANUP_RE = re.compile(r'(\n{3,})|(\d+\.) ')
+
+# HTML blocks of the paper metadata section shown at the top of each post
+_META_HEADER_TMPL = """<div class="paper-meta">
+  <div class="paper-meta-item">
+    <span class="paper-meta-label">Authors:</span>
+    <div class="paper-authors">
+      {authors}
+    </div>
+  </div>
+  <div class="paper-meta-item">
+    <span class="paper-meta-label">Published:</span>
+    <span>{published}</span>
+  </div>
+"""
+_META_VENUE_TMPL = """  <div class="paper-meta-item">
+    <span class="paper-meta-label">Venue:</span>
+    <span>{venue}</span>
+  </div>
+"""
+_META_LINK_TMPL = """  <div class="paper-meta-item">
+    <span class="paper-meta-label">Original Paper:</span>
+    <a href="{url}" target="_blank" rel="noopener">View Paper</a>
+  </div>
+</div>
+
+"""
 
+@functools.lru_cache(maxsize=2048)
 def escape_caption(caption: str) -> str:
     """Escape caption text for Hugo shortcode."""
     if not caption:
         return ""
+    
+    if not _CAPTION_SPECIAL_RE.search(caption):
+        return caption
         
     caption = ' '.join(caption.splitlines())
-    caption = re.sub(r'(?<!\\)"', "'", caption)
-    caption = caption.replace('\\"', '"').replace('"', '\\"')
-    caption = caption.replace('`', '\\`')
-    caption = caption.replace('\\', '\\\\')
-    caption = caption.replace('$', '\\$')
+    caption = _UNESCAPED_QUOTE_RE.sub("'", caption)
+    # Remaining quotes are already escaped; double backslashes (including the one
+    # added before each backtick) and escape dollars in one pass
+    caption = caption.translate(_CAPTION_TRANS)
     
     return caption
 
+@functools.lru_cache(maxsize=2048)
 def format_caption(elem_id: str, caption_text: str, is_subfigure: bool = False, subfig_id: str = None) -> str:
     """Format caption text with proper figure/table numbering."""
     try:
         # Extract number from elem_id (e.g., "fig2" -> "2", "appendix_tab1" -> "1")
-        id_match = re.search(r'(?:appendix_)?(?:fig|tab)(\d+)', elem_id)
+        id_match = _ELEM_NUMBER_RE.search(elem_id)
         number = id_match.group(1) if id_match else ""
         
         if is_subfigure:
@@ -70,6 +110,9 @@ def process_figure_references(markdown: str, post: Post) -> str:
     """
     Process all figure references in markdown and append figure markdown.
     
+    Figure shortcodes are inserted after the line containing the first reference
+    to each figure, and the references themselves are replaced with plain text.
+    
     Args:
         markdown: The input markdown text
         post: Post object containing the figures data
@@ -77,82 +120,89 @@ def process_figure_references(markdown: str, post: Post) -> str:
     Returns:
         Processed markdown with figure shortcodes added
     """
-    # Split markdown into lines for processing
-    lines = markdown.splitlines()
-    processed_lines = []
+    if '<FIGURE_ID>' not in markdown:
+        return markdown
+    
     processed_figures = set()
+    figure_markdown_lines = []
+    parts = []
+    pos = 0
     
-    # Figure reference pattern - updated to handle both uppercase and lowercase subfigure letters
-    figure_pattern = r'<FIGURE_ID>(\d+)(\.([a-zA-Z]))?\</FIGURE_ID>'
+    def replace_reference(match: re.Match) -> str:
+        # Collect the figure for this reference while replacing it with a text reference
+        figure_markdown = _figure_reference_markdown(match, post, processed_figures)
+        if figure_markdown:
+            figure_markdown_lines.append(figure_markdown)
+        return _figure_reference_text(match)
     
-    for line in lines:
-        processed_lines.append(line)
-        
-        # Find all figure references in this line
-        matches = list(re.finditer(figure_pattern, line))
-        
-        if not matches:
-            continue
+    # Walk the lines that contain references in a single forward pass
+    while True:
+        match = _FIGURE_ID_RE.search(markdown, pos)
+        if not match:
+            break
             
-        figure_markdown_lines = []
+        line_end = markdown.find("\n", match.end())
+        if line_end == -1:
+            line_end = len(markdown)
         
-        # Process each match and add figure markdown
-        for match in matches:
-            full_match = match.group(0)
-            fig_num = match.group(1)
-            subfig_letter = match.group(3)  # Will be None for main figures
-            
-            # Log the detected reference for debugging
-            logger.info(f"Found figure reference: {full_match} (fig_num={fig_num}, subfig_letter={subfig_letter})")
-            
-            # Normalize subfigure letter to lowercase for internal processing
-            subfig_letter_normalized = subfig_letter.lower() if subfig_letter else None
-            
-            # Create a key for tracking processed figures
-            fig_key = f"{fig_num}"
-            if subfig_letter_normalized:
-                fig_key += f".{subfig_letter_normalized}"
-                
-            # Skip if we've already processed this figure
-            if fig_key in processed_figures:
-                logger.info(f"Skipping already processed figure: {fig_key}")
-                continue
-                
-            processed_figures.add(fig_key)
-            
-            # Generate and add figure markdown
-            fig_id = f"fig{fig_num}"
-            figure = post.get_figure(fig_id)
-            
-            if figure:
-                logger.info(f"Found figure object for {fig_id}")
-                if subfig_letter and figure.has_subfigures:
-                    logger.info(f"Figure has subfigures: {[s['id'] for s in figure.subfigures]}")
-                
-                # Generate figure markdown based on type
-                figure_markdown = generate_figure_markdown(figure, fig_id, subfig_letter_normalized)
-                if figure_markdown:
-                    figure_markdown_lines.append(figure_markdown)
-                else:
-                    logger.warning(f"Failed to generate markdown for {fig_id}{'.'+subfig_letter if subfig_letter else ''}")
-            else:
-                logger.warning(f"Figure {fig_id} not found in post figures")
+        figure_markdown_lines.clear()
+        parts.append(_FIGURE_ID_RE.sub(replace_reference, markdown[pos:line_end]))
         
-        # Add all figures for this line with line breaks
+        # Add all figures for this line surrounded by empty lines
         if figure_markdown_lines:
-            processed_lines.append("")  # Add empty line before figures
-            processed_lines.extend(figure_markdown_lines)
-            processed_lines.append("")  # Add empty line after figures
+            parts.append("\n\n" + "\n".join(figure_markdown_lines) + "\n")
+        
+        pos = line_end
+    
+    parts.append(markdown[pos:])
+    return "".join(parts)
+
+def _figure_reference_text(match: re.Match) -> str:
+    """Plain text replacement for a figure reference, e.g. "Figure 3.b"."""
+    return f"Figure {match.group(1)}" + (f".{match.group(2)}" if match.group(2) else "")
+
+def _figure_reference_markdown(match: re.Match, post: Post, processed_figures: set) -> str:
+    """
+    Generate the figure markdown for a single figure reference.
+    
+    Args:
+        match: Figure reference match
+        post: Post object containing the figures data
+        processed_figures: Keys of figures already added, updated in place
+        
+    Returns:
+        Figure markdown, or "" if the figure was already added or can't be found
+    """
+    fig_num = match.group(1)
+    subfig_letter = match.group(2)  # Will be None for main figures
+    
+    # Normalize subfigure letter to lowercase for internal processing
+    subfig_letter_normalized = subfig_letter.lower() if subfig_letter else None
     
-    # Replace the figure references with text references
-    result = "\n".join(processed_lines)
+    # Create a key for tracking processed figures
+    fig_key = f"{fig_num}"
+    if subfig_letter_normalized:
+        fig_key += f".{subfig_letter_normalized}"
+        
+    # Skip if we've already processed this figure
+    if fig_key in processed_figures:
+        return ""
+        
+    processed_figures.add(fig_key)
     
-    # Replace references with plain text - updated to handle both uppercase and lowercase
-    result = re.sub(r'<FIGURE_ID>(\d+)(\.([a-zA-Z]))?\</FIGURE_ID>', lambda m: 
-                  f"Figure {m.group(1)}" + (f".{m.group(3)}" if m.group(3) else ""), 
-                  result)
+    # Generate figure markdown
+    fig_id = f"fig{fig_num}"
+    figure = post.get_figure(fig_id)
     
-    return result
+    if not figure:
+        logger.warning(f"Figure {fig_id} not found in post figures")
+        return ""
+        
+    # Generate figure markdown based on type
+    figure_markdown = generate_figure_markdown(figure, fig_id, subfig_letter_normalized)
+    if not figure_markdown:
+        logger.warning(f"Failed to generate markdown for {fig_id}{'.'+subfig_letter if subfig_letter else ''}")
+    return figure_markdown
 
 def generate_figure_markdown(figure: Figure, fig_id: str, subfig_letter: str = None) -> str:
     """Generate markdown for a figure or subfigure."""
@@ -161,12 +211,8 @@ def generate_figure_markdown(figure: Figure, fig_id: str, subfig_letter: str = N
         
     if subfig_letter:
         # Handle specific subfigure
-        # Try to find the subfigure regardless of case
-        subfig_data = None
-        for subfig in figure.subfigures:
-            if subfig['id'].lower() == subfig_letter.lower():
-                subfig_data = subfig
-                break
+        # Find the subfigure regardless of case
+        subfig_data = figure.get_subfigure(subfig_letter)
                 
         if subfig_data:
             subfig_id = f"{fig_id}_{subfig_data['id']}"  # Use original ID from data
@@ -200,120 +246,97 @@ def generate_figure_markdown(figure: Figure, fig_id: str, subfig_letter: str = N
         formatted_caption = format_caption(fig_id, figure.caption)
         return f'{{{{< figure src="{fig_id}.png" caption="{escape_caption(formatted_caption)}" >}}}}'
 
-def create_post_markdown(post: Post) -> str:
+def _cleanup_match(match: re.Match) -> str:
+    """Replacement for _CLEANUP_RE matches."""
+    if match.group(1):
+        return '\n\n'
+    return f'\n\n{match.group(2)} '
+
+def _yaml_date(value):
+    """Convert a datetime to a date so it is emitted as a plain YAML date."""
+    return value.date() if isinstance(value, datetime) else value
+
+def create_post_markdown(post: Post, today: Optional[date] = None) -> str:
     """
     Generate markdown content for the post, handling subfigures with improved formatting.
     
     Args:
         post: Post object containing article, summary, and figures
+        today: Date the post is added; defaults to the current date. Pass the same
+            value for every post in a run to avoid re-reading the clock.
     
     Returns:
         Markdown string for the post
     """
+    if today is None:
+        today = datetime.now().date()
+    
     article = post.article
     summary = post.summary
     post_dir = post.post_dir
     
+    # Read optional article attributes once
+    abstract = getattr(article, 'abstract', '') or ''
+    tldr = getattr(article, 'tldr', '') or ''
+    venue = getattr(article, 'venue', '') or ''
+    submitted_date = getattr(article, 'submitted_date', None)
+    tags_raw = getattr(article, 'tags', None)
+    highlight = bool(getattr(article, 'highlight', False))
+    
     # Format frontmatter
     author_list = article.authors if isinstance(article.authors, list) else []
-    quoted_authors = [f'"{author.strip()}"' for author in author_list]
-    description = article.abstract[:200] + "..." if hasattr(article, 'abstract') and len(article.abstract) > 200 else article.abstract if hasattr(article, 'abstract') else ''
-    abstract = article.abstract if hasattr(article, 'abstract') else ''
-    tldr = article.tldr if hasattr(article, 'tldr') and article.tldr else ''
+    description = abstract[:200] + "..." if len(abstract) > 200 else abstract
     
     # Additional metadata for improved display
-    venue = article.venue if hasattr(article, 'venue') and article.venue else ''
-    publication_date = article.submitted_date.strftime('%B %d, %Y') if hasattr(article, 'submitted_date') and article.submitted_date else 'Unknown'
+    publication_date = submitted_date.strftime('%B %d, %Y') if submitted_date else 'Unknown'
     
     # Define tags if available
     tags = []
-    if hasattr(article, 'tags') and article.tags:
-        tags = article.tags if isinstance(article.tags, list) else [article.tags]
-    
-    # Format tags for YAML
-    tags_yaml = ""
-    if tags:
-        tags_yaml = "tags: [" + ", ".join([f'"{tag.strip()}"' for tag in tags]) + "]\n"
-        
-    # Add highlight status
-    highlight = hasattr(article, 'highlight') and article.highlight
-
-    frontmatter = f"""---
-title: "{escape_yaml(article.title)}"
-description: "{escape_yaml(description)}"
-authors: [{', '.join(quoted_authors)}]
-date: {datetime.now().strftime('%Y-%m-%d')}
-publication_date: {article.submitted_date.strftime('%Y-%m-%d') if hasattr(article, 'submitted_date') and article.submitted_date else 'Unknown'}
-venue: "{escape_yaml(venue)}"
-paper_url: "{article.url}"
-abstract: "{escape_yaml(abstract)}"
-tldr: "{escape_yaml(tldr)}"
-added_date: {datetime.now().strftime('%Y-%m-%d')}
-bookcase_cover_src: '/posts/paper_{article.uid}/thumbnail.png'
-highlight: {str(highlight).lower()}
-{tags_yaml}math: true
-katex: true
-weight: 1
----
+    if tags_raw:
+        tags = tags_raw if isinstance(tags_raw, list) else [tags_raw]
 
-"""
+    # Let the YAML emitter handle quoting and escaping of free text from paper metadata
+    frontmatter_data = {
+        'title': article.title,
+        'description': description,
+        'authors': [author.strip() for author in author_list],
+        'date': today,
+        'publication_date': _yaml_date(submitted_date) if submitted_date else 'Unknown',
+        'venue': venue,
+        'paper_url': article.url,
+        'abstract': abstract,
+        'tldr': tldr,
+        'added_date': today,
+        'bookcase_cover_src': f'/posts/paper_{article.uid}/thumbnail.png',
+        'highlight': highlight,
+    }
+    if tags:
+        frontmatter_data['tags'] = [tag.strip() for tag in tags]
+    frontmatter_data.update({'math': True, 'katex': True, 'weight': 1})
+    
+    frontmatter = "---\n" + yaml.safe_dump(frontmatter_data, sort_keys=False, allow_unicode=True, width=float('inf')) + "---\n\n"
 
     # Metadata section for better display in the post
-    metadata_section = f"""<div class="paper-meta">
-  <div class="paper-meta-item">
-    <span class="paper-meta-label">Authors:</span>
-    <div class="paper-authors">
-      {', '.join(author_list)}
-    </div>
-  </div>
-  <div class="paper-meta-item">
-    <span class="paper-meta-label">Published:</span>
-    <span>{publication_date}</span>
-  </div>
-"""
-
-    # Add venue if available
+    meta_parts = [_META_HEADER_TMPL.format(authors=', '.join(author_list), published=publication_date)]
     if venue:
-        metadata_section += f"""  <div class="paper-meta-item">
-    <span class="paper-meta-label">Venue:</span>
-    <span>{venue}</span>
-  </div>
-"""
-
-    # Add original paper link
-    metadata_section += f"""  <div class="paper-meta-item">
-    <span class="paper-meta-label">Original Paper:</span>
-    <a href="{article.url}" target="_blank" rel="noopener">View Paper</a>
-  </div>
-</div>
-
-"""
+        meta_parts.append(_META_VENUE_TMPL.format(venue=venue))
+    meta_parts.append(_META_LINK_TMPL.format(url=article.url))
+    metadata_section = "".join(meta_parts)
     
     # Main content - ensure proper spacing and formatting (don't add Paper Summary twice)
-    if summary.startswith("# Paper Summary"):
-        content_section = f"""
-
-{summary}"""
-    else:
-        content_section = f"""
-
-# Paper Summary
-
-{summary}"""
+    summary_heading = "\n\n" if summary.startswith("# Paper Summary") else "\n\n# Paper Summary\n\n"
     
-    # Combine all sections
-    full_content = frontmatter + metadata_section + content_section
+    # Combine the body sections; the frontmatter is left untouched so the YAML stays valid
+    body = "".join([metadata_section, summary_heading, summary])
     
     # Process figure references - use the new standalone function
-    full_content = process_figure_references(full_content, post)
-    
-    # Clean up any multiple consecutive blank lines
-    full_content = re.sub(r'\n{3,}', '\n\n', full_content)
+    body = process_figure_references(body, post)
     
-    # Ensure proper spacing between sections (numbered points)
-    full_content = re.sub(r'(\d+\.) ', r'\n\n\1 ', full_content)
+    # Collapse multiple consecutive blank lines and put numbered points on their own
+    # paragraph in one pass; the two patterns never overlap, so this matches applying them in turn
+    body = _CLEANUP_RE.sub(_cleanup_match, body)
     
-    return full_content
+    return frontmatter + body
 
 def save_post_markdown(post: Post) -> Path:
     """
@@ -334,8 +357,8 @@ def save_post_markdown(post: Post) -> Path:
     
     # Save markdown
     index_path = post_dir / "index.md"
-    with open(index_path, 'w', encoding='utf-8') as f:
-        f.write(markdown)
+    with open(index_path, 'wb') as f:
+        f.write(markdown.encode('utf-8'))
     
     # Process display figures
     post.process_display_figures()
@@ -2,15 +2,61 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 import logging
+import re
+import functools
+import hashlib
+import os
 import shutil
 import requests
-from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.file_utils import file_sha256, link_or_copy
+from src.utils.http_session import create_http_session
 
 logger = logging.getLogger(__name__)
 
+# Bytes read per chunk when streaming a PDF download to disk
+PDF_DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Number of PDFs fetched at once by download_pdfs
+PDF_DOWNLOAD_WORKERS = 8
+
+# PDFs are already compressed, so ask servers not to wrap them in another content encoding
+_PDF_REQUEST_HEADERS = {'Accept-Encoding': 'identity'}
+
+@functools.lru_cache(maxsize=None)
+def _default_session() -> requests.Session:
+    """Pooled session shared by downloads that aren't given one, created on first use."""
+    return create_http_session()
+
+# arXiv paper URL, capturing the ID (including any version or old-style archive prefix)
+_ARXIV_URL_RE = re.compile(r'arxiv\.org/(?:abs|pdf)/([^?#]+?)(?:\.pdf)?/?(?:[?#]|$)')
+
+# Internal figure keys look like "fig_0_<number>_<label>", e.g. "fig_0_3_fig3"
+_FIGURE_KEY_RE = re.compile(r'^fig_0_(\d+)_(?:.*_)?(fig\d+|tab\d+|unk)$')
+
+class _HashingWriter:
+    """Writable wrapper that feeds everything written through it to a hash."""
+    
+    def __init__(self, f, digest):
+        self._f = f
+        self._digest = digest
+    
+    def write(self, data: bytes) -> int:
+        self._digest.update(data)
+        return self._f.write(data)
+
 class Article:
     """Class representing a scientific article."""
     
+    # Fixed attribute set; a run can hold many articles, so skip the per-instance __dict__
+    __slots__ = (
+        'uid', 'title', 'url', 'authors', 'abstract', 'pdf_path', 'data_folder',
+        'website_content_path', 'venue', 'submitted_date', 'tldr', 'tags', 'highlight',
+        '_figures', '_figs_by_num', 'display_figures', 'thumbnail_source',
+        'appendix_page_number', 'body_pdf_path', 'appendix_pdf_path',
+    )
+    
     def __init__(
         self,
         uid: str,
@@ -45,6 +91,26 @@ class Article:
         self.body_pdf_path: Optional[Path] = None  # Path to body-only PDF
         self.appendix_pdf_path: Optional[Path] = None  # Path to appendix-only PDF
         
+    @property
+    def figures(self) -> Dict[str, Any]:
+        """Figures extracted from the paper, keyed by internal figure ID."""
+        return self._figures
+    
+    @figures.setter
+    def figures(self, figures: Dict[str, Any]) -> None:
+        self._figures = figures
+        # Index figure labels by figure number so lookups don't rescan every figure
+        self._figs_by_num: Dict[str, tuple] = {}
+        for fig_id in figures:
+            match = _FIGURE_KEY_RE.match(fig_id)
+            if match:
+                self._figs_by_num.setdefault(match.group(1), (fig_id, match.group(2)))
+    
+    def get_figure_label(self, fig_num: str) -> Optional[str]:
+        """Get the label (e.g. "fig3", "tab1") of the figure with the given number, if any."""
+        entry = self._figs_by_num.get(str(fig_num))
+        return entry[1] if entry else None
+        
     def set_authors(self, authors: List[str]) -> None:
         """Set the paper authors."""
         self.authors = authors
@@ -74,8 +140,17 @@ class Article:
         """Set the source figure for the thumbnail."""
         self.thumbnail_source = source
     
-    def download_pdf(self) -> bool:
-        """Download the PDF for this article."""
+    def download_pdf(self, session: Optional[requests.Session] = None) -> bool:
+        """
+        Download the PDF for this article.
+        
+        Args:
+            session: Optional shared session; defaults to a module-wide pooled session
+                so consecutive downloads reuse connections
+            
+        Returns:
+            True if the PDF is available locally
+        """
         if not self.url or not self.data_folder:
             logger.error(f"Cannot download PDF: URL or data folder not set for {self.uid}")
             return False
@@ -97,10 +172,9 @@ class Article:
             print("Downloading PDF for:")
             print(self.url)
             if 'arxiv.org' in self.url:
-                parsed_url = urlparse(self.url)
-                path_parts = parsed_url.path.strip('/').split('/')
-                if len(path_parts) > 0:
-                    arxiv_id = path_parts[-1]
+                arxiv_match = _ARXIV_URL_RE.search(self.url)
+                if arxiv_match:
+                    arxiv_id = arxiv_match.group(1)
                     pdf_url = f"https://arxiv.org/pdf/{arxiv_id}.pdf"
                 else:
                     logger.error(f"Could not parse arXiv ID from URL: {self.url}")
@@ -109,22 +183,60 @@ class Article:
                 logger.warning(f"Not an arXiv URL, using original URL for PDF: {self.url}")
                 pdf_url = self.url
                 
-            # Download PDF
-            response = requests.get(pdf_url, stream=True, timeout=30)
-            if response.status_code == 200:
-                with open(self.pdf_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                logger.debug(f"Downloaded PDF for {self.uid}")
-                return True
-            else:
-                logger.error(f"Failed to download PDF for {self.uid}: {response.status_code}")
-                return False
+            # Download PDF, closing the response on every path so its connection goes back to the pool
+            with (session or _default_session()).get(pdf_url, headers=_PDF_REQUEST_HEADERS, stream=True, timeout=30) as response:
+                if response.status_code != 200:
+                    logger.error(f"Failed to download PDF for {self.uid}: {response.status_code}")
+                    return False
+                
+                # Copy straight from the raw stream, letting urllib3 undo any content encoding
+                response.raw.decode_content = True
+                # Hash the bytes as they are written so the PDF needn't be read back to identify it
+                digest = hashlib.sha256()
+                # Write to a temporary file and rename it into place, so a failed download never
+                # leaves a truncated PDF that the exists() check above would take as complete
+                tmp_path = self.pdf_path.with_suffix(self.pdf_path.suffix + '.tmp')
+                try:
+                    with open(tmp_path, 'wb') as f:
+                        shutil.copyfileobj(response.raw, _HashingWriter(f, digest), PDF_DOWNLOAD_CHUNK_SIZE)
+                    os.replace(tmp_path, self.pdf_path)
+                except Exception:
+                    tmp_path.unlink(missing_ok=True)
+                    raise
+            
+            self._pdf_digest_path().write_text(digest.hexdigest())
+            logger.debug(f"Downloaded PDF for {self.uid}")
+            return True
                 
         except Exception as e:
             logger.error(f"Error downloading PDF for {self.uid}: {e}")
             return False
     
+    def _pdf_digest_path(self) -> Path:
+        """Sidecar file holding the SHA-256 digest of the PDF."""
+        return self.pdf_path.with_name(self.pdf_path.name + ".sha256")
+    
+    def get_pdf_sha256(self) -> Optional[str]:
+        """
+        Get the SHA-256 digest of the downloaded PDF.
+        
+        The digest recorded at download time is reused while it is newer than the
+        PDF; otherwise the PDF is hashed and the digest recorded again.
+        
+        Returns:
+            Hex digest, or None if the PDF is not available
+        """
+        if not self.pdf_path or not self.pdf_path.exists():
+            return None
+        
+        digest_path = self._pdf_digest_path()
+        if digest_path.exists() and digest_path.stat().st_mtime >= self.pdf_path.stat().st_mtime:
+            return digest_path.read_text().strip()
+        
+        digest = file_sha256(self.pdf_path)
+        digest_path.write_text(digest)
+        return digest
+    
     def create_thumbnail(self) -> Optional[Path]:
         """Create a thumbnail for this article."""
         if not self.data_folder:
@@ -144,14 +256,14 @@ class Article:
             if self.thumbnail_source == 'full':
                 # Use the first figure as thumbnail
                 for fig_path in figures_dir.glob("*.png"):
-                    shutil.copy2(fig_path, thumbnail_path)
+                    link_or_copy(fig_path, thumbnail_path)
                     logger.debug(f"Created thumbnail for {self.uid} from {fig_path.name}")
                     return thumbnail_path
             else:
                 # Use specific figure as thumbnail
                 source_path = figures_dir / f"{self.thumbnail_source}.png"
                 if source_path.exists():
-                    shutil.copy2(source_path, thumbnail_path)
+                    link_or_copy(source_path, thumbnail_path)
                     logger.debug(f"Created thumbnail for {self.uid} from {source_path.name}")
                     return thumbnail_path
                 else:
@@ -162,4 +274,23 @@ class Article:
             
         except Exception as e:
             logger.error(f"Error creating thumbnail for {self.uid}: {e}")
-            return None
\ No newline at end of file
+            return None
+
+def download_pdfs(articles: List[Article], session: Optional[requests.Session] = None,
+                  max_workers: int = PDF_DOWNLOAD_WORKERS) -> List[bool]:
+    """
+    Download the PDFs for several articles concurrently.
+    
+    Downloads are network-bound, so a thread pool overlaps their latency while
+    the pooled session keeps connections to the same host alive.
+    
+    Args:
+        articles: Articles with URL and data folder set
+        session: Optional shared session passed to each download
+        max_workers: Maximum number of downloads in flight
+        
+    Returns:
+        Result of download_pdf for each article, in the same order
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda article: article.download_pdf(session=session), articles))
@@ -4,7 +4,9 @@ import logging
 from abc import ABC, abstractmethod
 import json
 import os
-import shutil
+
+from src.utils.file_utils import link_or_copy
+from src.utils.json_utils import read_json
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +28,24 @@ class Figure:
         self.subfigures = subfigures or []
         self.type = type
         self.path = path
+    
+    @property
+    def subfigures(self) -> List[Dict[str, Any]]:
+        """Subfigure metadata dicts, each with an 'id' letter and a 'caption'."""
+        return self._subfigures
+    
+    @subfigures.setter
+    def subfigures(self, subfigures: List[Dict[str, Any]]) -> None:
+        self._subfigures = subfigures
+        # Index subfigures by lowercased ID so lookups don't rescan the list
+        self._subfigs_by_id: Dict[str, Dict[str, Any]] = {}
+        for subfig in subfigures:
+            if 'id' in subfig:
+                self._subfigs_by_id.setdefault(subfig['id'].lower(), subfig)
+    
+    def get_subfigure(self, subfig_id: str) -> Optional[Dict[str, Any]]:
+        """Get the subfigure with the given ID, ignoring case, if any."""
+        return self._subfigs_by_id.get(subfig_id.lower())
         
     def to_dict(self) -> Dict[str, Any]:
         """Convert figure to dictionary representation."""
@@ -63,13 +83,23 @@ class Figure:
         Returns:
             Path to the saved figure.
         """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for src, dst in self.get_copy_tasks(output_dir):
+            link_or_copy(src, dst)
+        
+        return output_dir / f"{self.id}.png"
+    
+    def get_copy_tasks(self, output_dir: Path) -> List[tuple]:
+        """
+        Get the files that saving this figure to a directory would copy.
+        
+        Returns:
+            List of (source, destination) paths for the figure and its subfigures.
+        """
         if not self.path:
             raise ValueError(f"Figure {self.id} has no associated image path")
         
-        output_dir.mkdir(parents=True, exist_ok=True)
-        output_path = output_dir / f"{self.id}.png"
-        
-        shutil.copy2(self.path, output_path)
+        tasks = [(self.path, output_dir / f"{self.id}.png")]
         
         # If there are subfigures, save them too
         if self.has_subfigures and self.subfigures:
@@ -80,9 +110,9 @@ class Figure:
                     
                 subfig_path = Path(str(self.path).replace(f"{self.id}.png", f"{self.id}_{subfig_id}.png"))
                 if subfig_path.exists():
-                    shutil.copy2(subfig_path, output_dir / f"{self.id}_{subfig_id}.png")
+                    tasks.append((subfig_path, output_dir / f"{self.id}_{subfig_id}.png"))
         
-        return output_path
+        return tasks
 
 
 class FigureExtractor(ABC):
@@ -141,8 +171,7 @@ class FigureExtractor(ABC):
             return {}
         
         try:
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                metadata_dict = json.load(f)
+            metadata_dict = read_json(metadata_path)
             
             figures = {}
             for fig_id, fig_data in metadata_dict.items():
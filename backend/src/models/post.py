@@ -2,14 +2,43 @@ from typing import Dict, List, Optional, Any, Type
 from pathlib import Path
 import logging
 import json
+import os
 import re
-import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 from src.models.article import Article
 from src.models.figure import Figure 
+from src.utils.file_utils import link_or_copy
+from src.utils.json_utils import read_json
 
 logger = logging.getLogger(__name__)
 
+# Number of figure files copied into a post directory at once
+FIGURE_COPY_WORKERS = 4
+
+# Written into the figures directory once extraction has completed successfully
+FIGURES_DONE_MARKER = ".done"
+
+# Subfigure reference such as "3.b"
+_SUBFIGURE_REF_RE = re.compile(r'(\d+)\.([a-z])')
+
+def mark_figures_complete(figures_dir: Path) -> Path:
+    """
+    Atomically create the completion marker in a figures directory.
+    
+    The marker is written to a temporary file and renamed into place, so a crash
+    can never leave a marker behind for a partially extracted directory.
+    
+    Returns:
+        Path to the marker file
+    """
+    marker_path = figures_dir / FIGURES_DONE_MARKER
+    fd, tmp_path = tempfile.mkstemp(dir=figures_dir, prefix=f"{FIGURES_DONE_MARKER}.")
+    os.close(fd)
+    os.replace(tmp_path, marker_path)
+    return marker_path
+
 class Post:
     """Class representing a blog post for a paper."""
     
@@ -68,6 +97,9 @@ class Post:
         # Create figures directory
         figures_dir.mkdir(parents=True, exist_ok=True)
         
+        # Clear any previous completion marker until this extraction succeeds
+        (figures_dir / FIGURES_DONE_MARKER).unlink(missing_ok=True)
+        
         try:
             # Extract figures
             extracted_figures = extractor.extract_figures(source_path, figures_dir)
@@ -82,6 +114,8 @@ class Post:
             # Update figures dictionary
             self.figures = {fig.id: fig for fig in extracted_figures}
             
+            mark_figures_complete(figures_dir)
+            
             return True
         except Exception as e:
             logger.error(f"Error extracting figures: {e}")
@@ -92,11 +126,13 @@ class Post:
         post_dir = self.post_dir
         post_dir.mkdir(parents=True, exist_ok=True)
         
+        figures_dir = self.article.data_folder / "figures"
         processed_main_figures = set()  # Track main figures we've processed
+        copy_tasks = {}  # Destination -> source, so each file is written once
         
         for fig_id in self.display_figures:
             # Check if it's a subfigure reference (e.g., "2.a")
-            subfig_match = re.match(r'(\d+)\.([a-z])', fig_id)
+            subfig_match = _SUBFIGURE_REF_RE.match(fig_id)
             if subfig_match:
                 main_id = f"fig{subfig_match.group(1)}"
                 subfig_id = subfig_match.group(2)
@@ -108,9 +144,9 @@ class Post:
                     continue
                 
                 # Copy subfigure
-                subfig_path = self.article.data_folder / "figures" / f"{main_id}_{subfig_id}.png"
+                subfig_path = figures_dir / f"{main_id}_{subfig_id}.png"
                 if subfig_path.exists():
-                    shutil.copy2(subfig_path, post_dir / f"{main_id}_{subfig_id}.png")
+                    copy_tasks[post_dir / f"{main_id}_{subfig_id}.png"] = subfig_path
                     
                 # Also process the main figure if we haven't already
                 if main_id not in processed_main_figures:
@@ -118,7 +154,7 @@ class Post:
                     figure = self.get_figure(main_id)
                     if figure and figure.path and "https:" not in str(figure.path):
                         if figure.path.exists():
-                            figure.save_to_directory(post_dir)
+                            copy_tasks.update((dst, src) for src, dst in figure.get_copy_tasks(post_dir))
                         else:
                             logger.warning(f"Figure {main_id} path does not exist")
             else:
@@ -134,20 +170,24 @@ class Post:
                         # Check that figure exists
                         if figure.path.exists():
                             # Copy figure to post directory
-                            figure.save_to_directory(post_dir)
+                            copy_tasks.update((dst, src) for src, dst in figure.get_copy_tasks(post_dir))
                             
                             # If this figure has subfigures, process them too
                             if figure.has_subfigures:
                                 for subfig in figure.subfigures:
                                     subfig_id = subfig.get('id')
                                     if subfig_id:
-                                        subfig_path = self.article.data_folder / "figures" / f"{fig_id_clean}_{subfig_id}.png"
+                                        subfig_path = figures_dir / f"{fig_id_clean}_{subfig_id}.png"
                                         if subfig_path.exists():
-                                            shutil.copy2(subfig_path, post_dir / f"{fig_id_clean}_{subfig_id}.png")
+                                            copy_tasks[post_dir / f"{fig_id_clean}_{subfig_id}.png"] = subfig_path
                         else:
                             logger.warning(f"Figure {fig_id_clean} not found")
                 else:
                     logger.warning(f"Figure {fig_id_clean} not found")
+        
+        # Copy the collected files concurrently, since each copy waits on disk IO
+        with ThreadPoolExecutor(max_workers=FIGURE_COPY_WORKERS) as executor:
+            list(executor.map(link_or_copy, copy_tasks.values(), copy_tasks.keys()))
 
     def set_thumbnail(self) -> bool:
         """
@@ -168,14 +208,14 @@ class Post:
                 return False
         
         # Check if it's a subfigure reference
-        subfig_match = re.match(r'(\d+)\.([a-z])', self.thumbnail_figure)
+        subfig_match = _SUBFIGURE_REF_RE.match(self.thumbnail_figure)
         if subfig_match:
             main_id = f"fig{subfig_match.group(1)}"
             subfig_id = subfig_match.group(2)
             
             source_path = self.article.data_folder / "figures" / f"{main_id}_{subfig_id}.png"
             if source_path.exists():
-                shutil.copy2(source_path, post_dir / "thumbnail.png")
+                link_or_copy(source_path, post_dir / "thumbnail.png")
                 return True
         else:
             # Handle regular figure
@@ -184,12 +224,12 @@ class Post:
             
             if figure and figure.path:
                 # Create a copy named thumbnail.png
-                shutil.copy2(figure.path, post_dir / "thumbnail.png")
+                link_or_copy(figure.path, post_dir / "thumbnail.png")
                 return True
             else:
                 source_path = self.article.data_folder / "figures" / f"{fig_id}.png"
                 if source_path.exists():
-                    shutil.copy2(source_path, post_dir / "thumbnail.png")
+                    link_or_copy(source_path, post_dir / "thumbnail.png")
                     return True
                     
                 # HANDLE EDGE CASE: Check if this is a main figure that has subfigures
@@ -202,7 +242,7 @@ class Post:
                         subfig_path = self.article.data_folder / "figures" / f"{fig_id}_{first_subfig_id}.png"
                         if subfig_path.exists():
                             logger.info(f"Using first subfigure {fig_id}_{first_subfig_id} as thumbnail for {fig_id}")
-                            shutil.copy2(subfig_path, post_dir / "thumbnail.png")
+                            link_or_copy(subfig_path, post_dir / "thumbnail.png")
                             return True
                 # If no subfigures found in the figure object, try to find subfigures in the figures directory
                 subfig_pattern = f"{fig_id}_[a-z].png"
@@ -211,7 +251,7 @@ class Post:
                     # Use the first subfigure (alphabetically sorted)
                     subfig_files.sort()
                     logger.info(f"Found subfigures for {fig_id}, using {subfig_files[0].name} as thumbnail")
-                    shutil.copy2(subfig_files[0], post_dir / "thumbnail.png")
+                    link_or_copy(subfig_files[0], post_dir / "thumbnail.png")
                     return True
                     
         logger.warning(f"Thumbnail figure {self.thumbnail_figure} not found")
@@ -255,8 +295,7 @@ class Post:
             return None
             
         try:
-            with open(summary_path, 'r', encoding='utf-8') as f:
-                summary_data = json.load(f)
+            summary_data = read_json(summary_path)
                 
             # Load figures
             figures_dir = article.data_folder / "figures"
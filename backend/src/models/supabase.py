@@ -2,7 +2,6 @@
 Supabase database client and schema for AI Safety Papers.
 """
 import os
-import json
 import logging
 import re
 from typing import List, Dict, Any, Optional
@@ -10,12 +9,18 @@ from pathlib import Path
 from datetime import datetime
 
 from supabase import create_client, Client
+from postgrest.types import ReturnMethod
 from src.utils.cloudflare_r2 import CloudflareR2Client
 from src.utils.config_loader import load_config
+from src.utils.json_utils import read_json_cached
                 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Columns read when converting paper rows to articles. Selecting these instead of '*'
+# keeps large columns such as embedding_vector out of the response payload.
+_ARTICLE_COLUMNS = 'id,title,authors,year,abstract,url,venue,tldr,submitted_date,highlight,tags,appendix_page_number'
+
 class SupabaseDB:
     """Supabase database client for AI Safety Papers."""
     
@@ -41,6 +46,8 @@ class SupabaseDB:
             
         self.client = create_client(url, key)
         
+        # IDs of all papers in the database, loaded lazily by get_paper_ids()
+        self._paper_ids_cache = None
             
         self.r2_client = CloudflareR2Client()
         self.logger.info("Initialized Supabase client and R2 client")
@@ -63,27 +70,8 @@ class SupabaseDB:
                 return self.update_paper(paper)
             
             # Insert paper
-            result = self.client.table('papers').insert({
-                'id': paper['id'],
-                'title': paper.get('title', ''),
-                'authors': paper.get('authors', []),
-                'year': paper.get('year'),
-                'abstract': paper.get('abstract', ''),
-                'url': paper.get('url', ''),
-                'venue': paper.get('venue', ''),
-                'tldr': paper.get('tldr', {}).get('text', '') if isinstance(paper.get('tldr'), dict) else paper.get('tldr', ''),
-                'submitted_date': paper.get('submitted_date'),
-                'highlight': paper.get('highlight', False),
-                'include_on_website': paper.get('include_on_website', False),
-                'post_to_bots': paper.get('post_to_bots', False),
-                'posted_date': paper.get('posted_date'),
-                'ai_safety_relevance': paper.get('ai_safety_relevance', 0),
-                'mech_int_relevance': paper.get('mech_int_relevance', 0),
-                'embedding_model': paper.get('embedding_model', ''),
-                'embedding_vector': paper.get('embedding_vector', []),
-                'tags': paper.get('tags', []),
-                'appendix_page_number': paper.get('appendix_page_number')
-            }).execute()
+            result = self.client.table('papers').insert(self._paper_to_row(paper)).execute()
+            self._remember_paper_ids([paper['id']])
             
             self.logger.debug(f"Added paper {paper['id']}")
             return result.data[0]
@@ -91,6 +79,75 @@ class SupabaseDB:
             self.logger.error(f"Error adding paper {paper.get('id', 'unknown')}: {e}")
             raise
     
+    def add_papers(self, papers: List[Dict[str, Any]]) -> int:
+        """
+        Add several new papers to the database in a single request.
+        
+        Papers whose ID already exists are left unchanged. If the batched request
+        fails, the papers are added one at a time with add_paper() so a single bad
+        row doesn't lose the rest.
+        
+        Args:
+            papers: List of paper data
+            
+        Returns:
+            Number of papers added
+        """
+        if not papers:
+            return 0
+            
+        try:
+            rows = [self._paper_to_row(paper) for paper in papers]
+            result = self.client.table('papers').upsert(rows, on_conflict='id', ignore_duplicates=True).execute()
+            self._remember_paper_ids(row['id'] for row in rows)
+            
+            self.logger.debug(f"Added {len(result.data)} of {len(rows)} papers")
+            return len(result.data)
+        except Exception as e:
+            self.logger.warning(f"Error adding {len(papers)} papers in one request, adding them individually: {e}")
+        
+        added = 0
+        for paper in papers:
+            try:
+                self.add_paper(paper)
+                added += 1
+            except Exception:
+                # add_paper already logged the error; keep going with the other papers
+                continue
+        return added
+    
+    def _paper_to_row(self, paper: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert paper data to a row for the papers table, filling in defaults.
+        
+        Args:
+            paper: Paper data
+            
+        Returns:
+            Row dict
+        """
+        return {
+            'id': paper['id'],
+            'title': paper.get('title', ''),
+            'authors': paper.get('authors', []),
+            'year': paper.get('year'),
+            'abstract': paper.get('abstract', ''),
+            'url': paper.get('url', ''),
+            'venue': paper.get('venue', ''),
+            'tldr': paper.get('tldr', {}).get('text', '') if isinstance(paper.get('tldr'), dict) else paper.get('tldr', ''),
+            'submitted_date': paper.get('submitted_date'),
+            'highlight': paper.get('highlight', False),
+            'include_on_website': paper.get('include_on_website', False),
+            'post_to_bots': paper.get('post_to_bots', False),
+            'posted_date': paper.get('posted_date'),
+            'ai_safety_relevance': paper.get('ai_safety_relevance', 0),
+            'mech_int_relevance': paper.get('mech_int_relevance', 0),
+            'embedding_model': paper.get('embedding_model', ''),
+            'embedding_vector': paper.get('embedding_vector', []),
+            'tags': paper.get('tags', []),
+            'appendix_page_number': paper.get('appendix_page_number')
+        }
+    
     def update_paper(self, paper: Dict[str, Any]) -> Dict[str, Any]:
         """
         Update an existing paper.
@@ -128,6 +185,57 @@ class SupabaseDB:
             self.logger.error(f"Error updating paper {paper.get('id', 'unknown')}: {e}")
             raise
     
+    def update_paper_fields(self, paper_id: str, fields: Dict[str, Any]) -> bool:
+        """
+        Update only the given columns of an existing paper.
+        
+        Unlike update_paper, columns that are not passed are left untouched and
+        the updated row is not echoed back.
+        
+        Args:
+            paper_id: Paper ID
+            fields: Mapping of column name to new value
+            
+        Returns:
+            True if successful
+        """
+        try:
+            if isinstance(fields.get('tldr'), dict):
+                fields = {**fields, 'tldr': fields['tldr'].get('text', '')}
+            
+            self.client.table('papers').update(fields, returning=ReturnMethod.minimal).eq('id', paper_id).execute()
+            
+            self.logger.debug(f"Updated fields {list(fields)} for paper {paper_id}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error updating paper {paper_id}: {e}")
+            raise
+    
+    def get_paper_ids(self) -> frozenset:
+        """
+        Get the IDs of all papers in the database.
+        
+        The IDs are fetched once; papers added through this client are added to the
+        cached set, so later calls don't query the database again.
+        
+        Returns:
+            Set of paper IDs
+        """
+        if self._paper_ids_cache is None:
+            result = self.client.table('papers').select('id').execute()
+            self._paper_ids_cache = frozenset(row['id'] for row in result.data)
+            self.logger.debug(f"Loaded {len(self._paper_ids_cache)} paper IDs from Supabase")
+        return self._paper_ids_cache
+    
+    def _remember_paper_ids(self, paper_ids) -> None:
+        """Add newly stored paper IDs to the cached set, if it has been loaded."""
+        if self._paper_ids_cache is not None:
+            self._paper_ids_cache = self._paper_ids_cache.union(paper_ids)
+    
+    def refresh_paper_ids(self) -> None:
+        """Drop the cached paper IDs so the next get_paper_ids() refetches them."""
+        self._paper_ids_cache = None
+    
     def get_papers(self) -> List[Dict[str, Any]]:
         """
         Get all website-enabled papers.
@@ -144,7 +252,7 @@ class SupabaseDB:
             data_dir = Path(config.get('data_dir', 'data'))
             
             # Get all papers that should be included on the website
-            result = self.client.table('papers').select('*').eq('include_on_website', True).execute()
+            result = self.client.table('papers').select(_ARTICLE_COLUMNS).eq('include_on_website', True).execute()
             
             papers = []
             for row in result.data:
@@ -197,7 +305,7 @@ class SupabaseDB:
         """
         try:
             # Get highlighted papers directly from Supabase
-            result = self.client.table('papers').select('*').eq('highlight', True).eq('include_on_website', True).execute()
+            result = self.client.table('papers').select(_ARTICLE_COLUMNS).eq('highlight', True).eq('include_on_website', True).execute()
             
             papers = []
             for row in result.data:
@@ -225,7 +333,7 @@ class SupabaseDB:
             Paper data or None if not found
         """
         try:
-            result = self.client.table('papers').select('*').eq('id', paper_id).execute()
+            result = self.client.table('papers').select(_ARTICLE_COLUMNS).eq('id', paper_id).execute()
             
             if not result.data:
                 self.logger.warning(f"Paper {paper_id} not found")
@@ -257,6 +365,30 @@ class SupabaseDB:
             self.logger.error(f"Error marking paper {paper_id} as posted: {e}")
             return False
     
+    def mark_papers_as_posted(self, paper_ids: List[str]) -> bool:
+        """
+        Mark several papers as posted in a single request.
+        
+        Args:
+            paper_ids: List of paper IDs
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not paper_ids:
+            return True
+            
+        try:
+            self.client.table('papers').update({
+                'posted_date': datetime.now().isoformat()
+            }, returning=ReturnMethod.minimal).in_('id', paper_ids).execute()
+            
+            self.logger.debug(f"Marked {len(paper_ids)} papers as posted")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error marking {len(paper_ids)} papers as posted: {e}")
+            return False
+    
     def get_papers_to_post(self) -> List[Dict[str, Any]]:
         """
         Get papers that need to be posted.
@@ -267,7 +399,7 @@ class SupabaseDB:
         try:
             # Get papers that need to be posted
             filter_condition = 'posted_date.is.null,highlight.eq.true'
-            result = self.client.table('papers').select('*').or_(filter_condition).execute()
+            result = self.client.table('papers').select(f'{_ARTICLE_COLUMNS},posted_date,post_to_bots,include_on_website').or_(filter_condition).execute()
             
             papers_to_post = []
             for row in result.data:
@@ -294,7 +426,7 @@ class SupabaseDB:
         """
         try:
             # First get all papers marked for website inclusion
-            result = self.client.table('papers').select('*').eq('include_on_website', True).execute()
+            result = self.client.table('papers').select(_ARTICLE_COLUMNS).eq('include_on_website', True).execute()
             
             papers_to_reprocess = []
             
@@ -540,16 +672,14 @@ class SupabaseDB:
                 
                 if meta_path.exists():
                     try:
-                        with open(meta_path, 'r') as f:
-                            figures_meta = json.load(f)
-                            caption = figures_meta.get(figure_id, {}).get('caption', '')
+                        figures_meta = read_json_cached(meta_path)
+                        caption = figures_meta.get(figure_id, {}).get('caption', '')
                     except Exception as meta_err:
                         self.logger.warning(f"Error reading figures.json: {meta_err}")
                 elif alt_meta_path.exists():
                     try:
-                        with open(alt_meta_path, 'r') as f:
-                            figures_meta = json.load(f)
-                            caption = figures_meta.get(figure_id, {}).get('caption', '')
+                        figures_meta = read_json_cached(alt_meta_path)
+                        caption = figures_meta.get(figure_id, {}).get('caption', '')
                     except Exception as meta_err:
                         self.logger.warning(f"Error reading figures_metadata.json: {meta_err}")
                 
@@ -1,9 +1,10 @@
-from typing import Tuple, List, Optional, Dict, Any
+from typing import Tuple, List, Optional, Dict, Any, Iterable
 import json
 from pathlib import Path
 import logging
 import base64
 import re
+from concurrent.futures import ThreadPoolExecutor
 from src.models.article import Article
 from src.models.supabase import SupabaseDB
 from .prompt import summarization_prompt
@@ -12,9 +13,32 @@ import os
 from litellm import completion
 from src.utils.config_loader import load_config
 from src.utils.pdf_utils import split_pdf_at_appendix
+from src.utils.json_utils import read_json
 
 dotenv.load_dotenv()
 
+# Figure ID tags in model summaries - handle both upper and lowercase subfigure letters
+_FIGURE_ID_RE = re.compile(r'<FIGURE_ID>(\d+)(\.([a-zA-Z]))?\</FIGURE_ID>')
+# Sections of the model response
+_SUMMARY_TAG_RE = re.compile(r'<SUMMARY>(.*?)</SUMMARY>', re.DOTALL)
+_SUMMARY_HEADING_RE = re.compile(r'# Paper Summary(.*?)$', re.DOTALL)
+_THUMBNAIL_TAG_RE = re.compile(r'<THUMBNAIL>(.*?)</THUMBNAIL>', re.DOTALL)
+# Subfigure reference such as "3.b"
+_SUBFIGURE_REF_RE = re.compile(r'(\d+)\.([a-z])')
+# Stored figure IDs such as "fig3" or "fig3_b"
+_FIGURE_KEY_RE = re.compile(r'fig(\d+)')
+_SUBFIGURE_KEY_RE = re.compile(r'fig(\d+)[_.]([a-zA-Z])')
+
+# Number of papers summarized at once by summarize_many
+SUMMARY_WORKERS = 4
+
+def _bold_figure_reference(match: re.Match) -> str:
+    """Render a figure ID tag as bold text, e.g. **Figure 3** or **Figure 3.b**."""
+    fig_num, subfig_letter = match.group(1), match.group(3)
+    if subfig_letter:
+        return f"**Figure {fig_num}.{subfig_letter}**"
+    return f"**Figure {fig_num}**"
+
 # openrouter/anthropic/claude-3-7-sonnet-latest
 # anthropic/claude-3-7-sonnet-latest
 class PaperSummarizer:
@@ -44,7 +68,70 @@ class PaperSummarizer:
         if self.db is None:
             self.db = SupabaseDB()
         
-        # First, try to get the appendix_page_number from Supabase if not already set
+        self._load_appendix_page_number(article)
+        
+        if not ignore_existing_summary:
+            existing_summary = self._load_existing_summary(article)
+            if existing_summary:
+                return existing_summary
+
+        pdf_to_summarize = self._prepare_pdf(article)
+        
+        # Call the model using the appropriate PDF and handle errors properly
+        try:
+            model_response = self._get_model_response(pdf_to_summarize)
+            
+            if not model_response:
+                self.logger.error(f"Empty response from model for article {article.uid}")
+                raise ValueError("Failed to generate summary: empty model response")
+        except Exception as e:
+            self.logger.error(f"Error during model call for article {article.uid}: {e}")
+            raise ValueError(f"Failed to generate summary: {str(e)}")
+        
+        return self._finalize_summary(article, model_response)
+
+    def summarize_many(self, articles: List[Article], ignore_existing_summary: bool = False,
+                       regenerate_uids: Iterable[str] = (),
+                       max_workers: int = SUMMARY_WORKERS) -> Dict[str, Tuple[str, List[str], Optional[str]]]:
+        """
+        Summarize several papers, running up to max_workers summarize() calls at once.
+        
+        Each paper is a separate model call; running a few at a time overlaps the
+        network waits without sending every PDF at once into the rate limits.
+        
+        Args:
+            articles: Article instances with PDF paths set
+            ignore_existing_summary: Whether to regenerate summaries that already exist
+            regenerate_uids: Uids of papers to regenerate even if ignore_existing_summary
+                is False, e.g. because their PDF changed
+            max_workers: Maximum number of papers summarized at once
+            
+        Returns:
+            Dictionary mapping article uid to the (summary, display_figures, thumbnail_figure)
+            tuple returned by summarize(). Papers that failed are omitted.
+        """
+        if self.db is None:
+            self.db = SupabaseDB()
+        
+        regenerate_uids = set(regenerate_uids)
+        
+        def summarize_one(article: Article) -> Optional[Tuple[str, List[str], Optional[str]]]:
+            try:
+                return self.summarize(article, ignore_existing_summary=ignore_existing_summary or article.uid in regenerate_uids)
+            except Exception as e:
+                self.logger.error(f"Error summarizing article {article.uid}: {e}")
+                return None
+        
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for article, result in zip(articles, executor.map(summarize_one, articles)):
+                if result:
+                    results[article.uid] = result
+        
+        return results
+
+    def _load_appendix_page_number(self, article: Article) -> None:
+        """Load the appendix page number from Supabase if it is not already set on the article."""
         if article.appendix_page_number is None:
             try:
                 # Query paper details to get the appendix_page_number
@@ -54,49 +141,102 @@ class PaperSummarizer:
                     self.logger.info(f"Loaded appendix page number {article.appendix_page_number} from Supabase for article {article.uid}")
             except Exception as e:
                 self.logger.warning(f"Error loading appendix page number from Supabase: {e}")
+
+    def _load_existing_summary(self, article: Article) -> Optional[Tuple[str, List[str], Optional[str]]]:
+        """
+        Load a previously generated summary from Supabase or local storage.
         
-        if not ignore_existing_summary:
-            summary_data = self.db.get_summary(article.uid)
-            if summary_data:
-                self.logger.info(f"Found existing summary in Supabase for article {article.uid}")
+        Args:
+            article: The article to look up
+            
+        Returns:
+            The (summary, display_figures, thumbnail_figure) tuple, or None if no summary exists
+        """
+        summary_data = self.db.get_summary(article.uid)
+        if summary_data:
+            self.logger.info(f"Found existing summary in Supabase for article {article.uid}")
+            
+            # Check if we need to extract figures
+            if not summary_data['display_figures']:
+                self.logger.info("Existing summary has empty display_figures. Attempting to extract figures from summary content.")
+                summary_content = summary_data['summary']
+                
+                # Extract figures from the summary using figure ID tags
+                figures = self._extract_figures_from_summary(summary_content)
+                
+                if figures:
+                    self.logger.info(f"Extracted figure IDs: {figures}")
+                    summary_data['display_figures'] = figures
+                    
+                    # update the db
+                    self.db.add_summary(
+                        article.uid, 
+                        summary_data['summary'],
+                        figures,
+                        summary_data.get('thumbnail_figure'),
+                        summary_data.get('markdown_summary', '')
+                    )
+                else:
+                    self.logger.info("No figures found in existing summary content.")
+                
+            # Generate markdown summary if it doesn't exist
+            markdown_summary = summary_data.get('markdown_summary', '')
+            if not markdown_summary:
+                self.logger.info("Generating markdown summary from existing summary")
+                markdown_summary = self.post_process_summary_to_markdown(article.uid, summary_data['summary'])
+                
+                # Update the database with the markdown summary
+                self.db.add_summary(
+                    article.uid,
+                    summary_data['summary'],
+                    summary_data['display_figures'],
+                    summary_data.get('thumbnail_figure'),
+                    markdown_summary
+                )
                 
+            # Return only the original 3 values for backward compatibility
+            return (
+                summary_data['summary'],
+                summary_data['display_figures'],
+                summary_data.get('thumbnail_figure')
+            )
+            
+        # Check for existing summary in local storage
+        summary_path = article.data_folder / "summary.json"
+        if summary_path.exists():
+            self.logger.info(f"Found existing summary in local storage for article {article.uid}")
+            try:
+                summary_data = read_json(summary_path)
+                    
                 # Check if we need to extract figures
                 if not summary_data['display_figures']:
-                    self.logger.info("Existing summary has empty display_figures. Attempting to extract figures from summary content.")
+                    self.logger.info("Local summary has empty display_figures. Attempting to extract figures.")
                     summary_content = summary_data['summary']
-                    
-                    # Extract figures from the summary using figure ID tags
                     figures = self._extract_figures_from_summary(summary_content)
                     
                     if figures:
-                        self.logger.info(f"Extracted figure IDs: {figures}")
+                        # Update the summary data with extracted figures
                         summary_data['display_figures'] = figures
                         
-                        # update the db
-                        self.db.add_summary(
-                            article.uid, 
-                            summary_data['summary'],
-                            figures,
-                            summary_data.get('thumbnail_figure'),
-                            summary_data.get('markdown_summary', '')
-                        )
-                    else:
-                        self.logger.info("No figures found in existing summary content.")
-                    
-                # Generate markdown summary if it doesn't exist
-                markdown_summary = summary_data.get('markdown_summary', '')
-                if not markdown_summary:
-                    self.logger.info("Generating markdown summary from existing summary")
-                    markdown_summary = self.post_process_summary_to_markdown(article.uid, summary_data['summary'])
-                    
-                    # Update the database with the markdown summary
+                        # Save updated data
+                        with open(summary_path, 'w', encoding='utf-8') as f:
+                            json.dump(summary_data, f, indent=4, ensure_ascii=False)
+                
+                # Generate markdown summary
+                markdown_summary = self.post_process_summary_to_markdown(article.uid, summary_data['summary'])
+                
+                # Store in Supabase for future use
+                try:
                     self.db.add_summary(
-                        article.uid,
-                        summary_data['summary'],
-                        summary_data['display_figures'],
+                        article.uid, 
+                        summary_data['summary'], 
+                        summary_data['display_figures'], 
                         summary_data.get('thumbnail_figure'),
                         markdown_summary
                     )
+                    self.logger.info(f"Migrated local summary to Supabase for article {article.uid}")
+                except Exception as e:
+                    self.logger.warning(f"Error migrating summary to Supabase: {e}")
                     
                 # Return only the original 3 values for backward compatibility
                 return (
@@ -104,55 +244,18 @@ class PaperSummarizer:
                     summary_data['display_figures'],
                     summary_data.get('thumbnail_figure')
                 )
-                
-            # Check for existing summary in local storage
-            summary_path = article.data_folder / "summary.json"
-            if summary_path.exists():
-                self.logger.info(f"Found existing summary in local storage for article {article.uid}")
-                try:
-                    with open(summary_path, 'r', encoding='utf-8') as f:
-                        summary_data = json.load(f)
-                        
-                    # Check if we need to extract figures
-                    if not summary_data['display_figures']:
-                        self.logger.info("Local summary has empty display_figures. Attempting to extract figures.")
-                        summary_content = summary_data['summary']
-                        figures = self._extract_figures_from_summary(summary_content)
-                        
-                        if figures:
-                            # Update the summary data with extracted figures
-                            summary_data['display_figures'] = figures
-                            
-                            # Save updated data
-                            with open(summary_path, 'w', encoding='utf-8') as f:
-                                json.dump(summary_data, f, indent=4, ensure_ascii=False)
-                    
-                    # Generate markdown summary
-                    markdown_summary = self.post_process_summary_to_markdown(article.uid, summary_data['summary'])
-                    
-                    # Store in Supabase for future use
-                    try:
-                        self.db.add_summary(
-                            article.uid, 
-                            summary_data['summary'], 
-                            summary_data['display_figures'], 
-                            summary_data.get('thumbnail_figure'),
-                            markdown_summary
-                        )
-                        self.logger.info(f"Migrated local summary to Supabase for article {article.uid}")
-                    except Exception as e:
-                        self.logger.warning(f"Error migrating summary to Supabase: {e}")
-                        
-                    # Return only the original 3 values for backward compatibility
-                    return (
-                        summary_data['summary'],
-                        summary_data['display_figures'],
-                        summary_data.get('thumbnail_figure')
-                    )
-                except Exception as e:
-                    self.logger.warning(f"Error loading existing summary: {e}. Generating new summary.")
+            except Exception as e:
+                self.logger.warning(f"Error loading existing summary: {e}. Generating new summary.")
+        
+        return None
 
-        # Production mode - continue with actual API call
+    def _prepare_pdf(self, article: Article) -> Path:
+        """
+        Return the PDF that should be sent to the model, splitting off the appendix if known.
+        
+        Raises:
+            ValueError: If PDF is not available
+        """
         if not article.pdf_path or not article.pdf_path.exists():
             self.logger.error("PDF path not set or file does not exist")
             raise ValueError("PDF file not available")
@@ -173,24 +276,26 @@ class PaperSummarizer:
                 article.body_pdf_path = body_pdf
                 article.appendix_pdf_path = appendix_pdf
         
-        # Call the model using the appropriate PDF and handle errors properly
-        try:
-            model_response = self._get_model_response(pdf_to_summarize)
-            
-            if not model_response:
-                self.logger.error(f"Empty response from model for article {article.uid}")
-                raise ValueError("Failed to generate summary: empty model response")
-        except Exception as e:
-            self.logger.error(f"Error during model call for article {article.uid}: {e}")
-            raise ValueError(f"Failed to generate summary: {str(e)}")
+        return pdf_to_summarize
+
+    def _finalize_summary(self, article: Article, model_response: str) -> Tuple[str, List[str], Optional[str]]:
+        """
+        Parse a model response and store the resulting summary locally and in Supabase.
         
+        Args:
+            article: The summarized article
+            model_response: The raw text response from the model
+            
+        Returns:
+            Tuple of summary text, display figure IDs and thumbnail figure ID
+        """
         # Parse the response using the XML tag structure - use more greedy matching
-        summary_match = re.search(r'<SUMMARY>(.*?)</SUMMARY>', model_response, re.DOTALL)
+        summary_match = _SUMMARY_TAG_RE.search(model_response)
         
         # If the normal match doesn't work, try a more expansive pattern
         if not summary_match:
             # Try matching everything after # Paper Summary
-            summary_match = re.search(r'# Paper Summary(.*?)$', model_response, re.DOTALL)
+            summary_match = _SUMMARY_HEADING_RE.search(model_response)
             
         # Debug - log the first few characters of the matched summary
         if summary_match:
@@ -213,13 +318,13 @@ class PaperSummarizer:
         figures = self._extract_figures_from_summary(summary)
         
         # For backward compatibility, still try to extract thumbnail from response
-        thumbnail_match = re.search(r'<THUMBNAIL>(.*?)</THUMBNAIL>', model_response, re.DOTALL)
+        thumbnail_match = _THUMBNAIL_TAG_RE.search(model_response)
         thumbnail = None
         if thumbnail_match:
             thumb_ref = thumbnail_match.group(1).strip()
             if thumb_ref and thumb_ref.lower() != "none":
                 # Handle both simple figure numbers and subfigure references
-                subfig_match = re.match(r'(\d+)\.([a-z])', thumb_ref)
+                subfig_match = _SUBFIGURE_REF_RE.match(thumb_ref)
                 if subfig_match:
                     thumbnail = f"{subfig_match.group(1)}.{subfig_match.group(2)}"
                 elif thumb_ref.isdigit():
@@ -235,6 +340,11 @@ class PaperSummarizer:
             'thumbnail_figure': thumbnail,
             'markdown_summary': markdown_summary
         }
+        # Record which PDF the summary was generated from so unchanged papers can skip the model
+        try:
+            summary_data['pdf_sha256'] = article.get_pdf_sha256()
+        except Exception as e:
+            self.logger.warning(f"Could not hash PDF for article {article.uid}: {e}")
 
         # Save to local storage as backup
         try:
@@ -257,47 +367,61 @@ class PaperSummarizer:
         # Return only the original 3 values for backward compatibility
         return summary, figures, thumbnail
 
-    def _get_model_response(self, pdf_path: Path) -> str:
+    def _build_messages(self, pdf_path: Path) -> List[Dict[str, Any]]:
         """
-        Get the response from the model for the given PDF.
+        Build the model messages for summarizing the given PDF.
         
         Args:
             pdf_path: Path to the PDF file
             
         Returns:
-            The text response from the model
+            List of messages to send to the model
         """
         # Read PDF file as base64
         with open(pdf_path, 'rb') as f:
             pdf_data = base64.b64encode(f.read()).decode('utf-8')
 
+        return [
+            {
+                "role": "user",
+                "content": [
+                    { # PDF file
+                        "type": "document",
+                        "source": {
+                            "type": "base64",
+                            "media_type": "application/pdf",
+                            "data": pdf_data
+                        },
+                        "citations": {"enabled": True},
+                        "context": "The PDF of the paper you should summarize."
+                    },
+                    { # Prompt
+                        "type": "text",
+                        "text": summarization_prompt,
+                        # "cache_control": {"type": "ephemeral"},
+                    }
+                ] 
+            }
+        ]
+
+    def _get_model_response(self, pdf_path: Path) -> str:
+        """
+        Get the response from the model for the given PDF.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            The text response from the model
+        """
+        messages = self._build_messages(pdf_path)
+
         try:
             # Call LiteLLM completion
             response = completion(
                 model=self.model_endpoint,
                 temperature=0,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            { # PDF file
-                                "type": "document",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": "application/pdf",
-                                    "data": pdf_data
-                                },
-                                "citations": {"enabled": True},
-                                "context": "The PDF of the paper you should summarize."
-                            },
-                            { # Prompt
-                                "type": "text",
-                                "text": summarization_prompt,
-                                # "cache_control": {"type": "ephemeral"},
-                            }
-                        ] 
-                    }
-                ],
+                messages=messages,
             )
 
             # Extract content from the response
@@ -326,6 +450,10 @@ class PaperSummarizer:
         if not summary:
             return ""
         
+        # Nothing to link, so skip looking up the figure URLs
+        if '<FIGURE_ID>' not in summary:
+            return summary
+        
         # Get all figure URLs for this article
         figure_urls = self._get_figure_urls(article_id)
         
@@ -362,7 +490,7 @@ class PaperSummarizer:
                     figure_urls[fig_id] = url
                     
                     # Check if this is a subfigure (fig7_a format)
-                    subfig_match = re.match(r'fig(\d+)[_.]([a-zA-Z])', fig_id)
+                    subfig_match = _SUBFIGURE_KEY_RE.match(fig_id)
                     if subfig_match:
                         main_num = subfig_match.group(1)
                         subfig_letter = subfig_match.group(2).lower()  # Normalize to lowercase
@@ -377,7 +505,7 @@ class PaperSummarizer:
                         subfigures_by_main[main_num].append((normalized_key, url))
                     else:
                         # For main figures (fig7 format), also store as just the number
-                        num_match = re.match(r'fig(\d+)', fig_id)
+                        num_match = _FIGURE_KEY_RE.match(fig_id)
                         if num_match:
                             main_num = num_match.group(1)
                             figure_urls[main_num] = url
@@ -399,13 +527,10 @@ class PaperSummarizer:
         """
         self.logger.info(f"Processing markdown with figures for article {article_id}")
         
-        # Regular expression to find figure ID tags - handle both upper and lowercase subfigure letters
-        figure_pattern = r'<FIGURE_ID>(\d+)(\.([a-zA-Z]))?\</FIGURE_ID>'
-        
         # Identify figures that only have subfigures but no main figure
         main_figs_with_only_subfigs = set()
         for key in figure_urls.keys():
-            subfig_match = re.match(r'fig(\d+)[_.]([a-zA-Z])', key)
+            subfig_match = _SUBFIGURE_KEY_RE.match(key)
             if subfig_match:
                 main_num = subfig_match.group(1)
                 # Check if this main figure exists directly
@@ -424,10 +549,10 @@ class PaperSummarizer:
         # Process each line
         for line in lines:
             # Find all figure references in this line
-            matches = list(re.finditer(figure_pattern, line))
+            matches = list(_FIGURE_ID_RE.finditer(line))
             
-            # Replace figure tags with bold text
-            processed_line = line
+            # Replace figure tags with bold text in a single left-to-right pass
+            processed_line = _FIGURE_ID_RE.sub(_bold_figure_reference, line) if matches else line
             line_figures = []  # Figures to add after this line
             
             for match in matches:
@@ -436,11 +561,7 @@ class PaperSummarizer:
                 
                 # Check if this is a main figure that only has subfigures
                 if not subfig_letter and fig_num in main_figs_with_only_subfigs:
-                    # This is a main figure with only subfigures - don't insert it directly,
-                    # but we'll still replace the tag with bold text
-                    display_text = f"Figure {fig_num}"
-                    processed_line = processed_line.replace(match.group(0), f"**{display_text}**")
-                    
+                    # This is a main figure with only subfigures - don't insert it directly
                     # Instead of showing the main figure, find and show all its subfigures
                     subfigure_keys = []
                     
@@ -486,9 +607,6 @@ class PaperSummarizer:
                 if subfig_letter:
                     display_text = f"Figure {fig_num}.{subfig_letter}"
                 
-                # Replace the tag with bold text
-                processed_line = processed_line.replace(match.group(0), f"**{display_text}**")
-                
                 # Generate figure keys for lookup - normalize to lowercase for consistency
                 fig_key = fig_num
                 if subfig_letter:
@@ -611,7 +729,7 @@ class PaperSummarizer:
         figures = []
         
         # Find all <FIGURE_ID> tags in the summary
-        figure_refs = re.findall(r'<FIGURE_ID>(\d+)(\.([a-zA-Z]))?\</FIGURE_ID>', summary)
+        figure_refs = _FIGURE_ID_RE.findall(summary)
         for ref in figure_refs:
             fig_num = ref[0]
             subfig_letter = ref[2]  # Will be None/empty for main figures
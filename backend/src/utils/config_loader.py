@@ -4,17 +4,42 @@ import re
 from typing import Dict, Any
 from pathlib import Path
 import logging
+from functools import lru_cache
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
 
+# Repository root, containing the backend config and secrets directories
+_PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+
+# Files whose modification times decide whether the cached config is still current
+_CONFIG_FILES = (
+    _PROJECT_ROOT / 'backend' / 'config' / 'config.yaml',
+    _PROJECT_ROOT / 'secrets' / 'config.yaml',
+)
+
 def load_config() -> Dict:
     """
     Load and merge configuration from default config, secrets, and environment variables.
     Order of precedence: environment variables > secrets > default config
+    
+    The result is cached and shared between callers, so it must not be modified.
+    It is reloaded automatically when a config file changes.
     """
+    return _load_config_cached(tuple(_mtime(path) for path in _CONFIG_FILES))
+
+def _mtime(path: Path) -> float:
+    """Modification time of path, or 0 if it doesn't exist."""
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return 0.0
+
+@lru_cache(maxsize=1)
+def _load_config_cached(config_mtimes: tuple) -> Dict:
+    """Load the config; cached per combination of config file modification times."""
     # Load environment variables from .env files
-    project_root = Path(__file__).parent.parent.parent.parent
+    project_root = _PROJECT_ROOT
     
     # Load from home directory first
     home_env_path = Path.home() / ".env"
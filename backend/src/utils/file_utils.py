@@ -0,0 +1,152 @@
+import os
+import sys
+import logging
+import shutil
+import hashlib
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Linux ioctl request that clones a whole file copy-on-write (btrfs, XFS)
+_FICLONE = 0x40049409
+
+def copy_file(src: Path, dst: Path) -> Path:
+    """
+    Copy the contents of src to dst without copying file metadata.
+
+    shutil.copyfile copies inside the kernel where the platform allows it
+    (os.sendfile on Linux, fcopyfile on macOS), so the bytes never pass through a
+    Python read/write loop, and it skips the extra stat/chmod/utime calls that
+    shutil.copy2 makes.
+
+    Args:
+        src: Source file
+        dst: Destination file (overwritten if it exists)
+
+    Returns:
+        Path to the destination file
+    """
+    shutil.copyfile(src, dst)
+    return dst
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 hex digest of a file's contents.
+
+    The file is read in chunks so large PDFs are never loaded into memory at once.
+
+    Args:
+        path: File to hash
+        chunk_size: Number of bytes read per chunk
+
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def write_text_atomic(path: Path, content: str, encoding: str = 'utf-8') -> Path:
+    """
+    Write text to path atomically.
+
+    The content is written to a sibling temporary file and then renamed over the
+    target, so readers never see a partially written file even if the process
+    crashes mid-write.
+
+    Args:
+        path: Destination file
+        content: Text to write
+        encoding: Text encoding
+
+    Returns:
+        Path to the written file
+    """
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    tmp_path.write_text(content, encoding=encoding)
+    os.replace(tmp_path, path)
+    return path
+
+def write_bytes_atomic(path: Path, data: bytes) -> Path:
+    """
+    Write bytes to path atomically.
+
+    Like write_text_atomic, the rename replaces the directory entry rather than
+    writing into the existing file, so post files hard-linked to path by
+    link_or_copy keep their contents.
+
+    Args:
+        path: Destination file
+        data: Bytes to write
+
+    Returns:
+        Path to the written file
+    """
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+    return path
+
+def link_or_copy(src: Path, dst: Path) -> Path:
+    """
+    Hard-link src to dst, falling back to a reflink clone and then a copy.
+
+    Linking avoids copying any bytes when the source and destination are on the
+    same filesystem, and a reflink shares data blocks on copy-on-write filesystems
+    where a link can't be made. An existing dst that is already linked to src, or
+    is an unlinked same-sized copy newer than src, is left alone. Any other dst is replaced
+    rather than written through. Since src and dst may share one inode afterwards,
+    files that can be linked must be rewritten by replacing them (write_text_atomic,
+    write_bytes_atomic, os.replace) rather than opened for writing in place.
+
+    Args:
+        src: Source file
+        dst: Destination file (replaced if it exists)
+
+    Returns:
+        Path to the destination file
+    """
+    dst = Path(dst)
+    if dst.exists():
+        if os.path.samefile(src, dst):
+            return dst
+        # Keep a copy made from the current source on an earlier run. A dst with other
+        # links is a link to some earlier source rather than a copy, so it is replaced.
+        src_stat, dst_stat = os.stat(src), dst.stat()
+        if (dst_stat.st_nlink == 1 and dst_stat.st_size == src_stat.st_size
+                and dst_stat.st_mtime >= src_stat.st_mtime):
+            return dst
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        logger.debug(f"Could not link {src} to {dst}, copying instead: {e}")
+        if not _reflink(src, dst):
+            copy_file(src, dst)
+    return dst
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """
+    Clone src to dst copy-on-write, sharing data blocks instead of copying them.
+
+    Only supported on Linux filesystems with reflink support. On failure dst may
+    be left as an empty file, to be overwritten by the caller's fallback copy.
+
+    Returns:
+        True if dst is now a clone of src
+    """
+    if fcntl is None or not sys.platform.startswith('linux'):
+        return False
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,26 @@
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+def create_http_session(pool_connections: int = 10, pool_maxsize: int = 20) -> requests.Session:
+    """
+    Create a requests session with a keep-alive connection pool.
+
+    Share one session between API clients so repeated requests to the same host
+    reuse open connections instead of paying a new TCP/TLS handshake each time.
+
+    Args:
+        pool_connections: Number of per-host connection pools to cache
+        pool_maxsize: Maximum number of connections kept alive per host
+
+    Returns:
+        Configured requests session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    logger.debug(f"Created HTTP session (pool_connections={pool_connections}, pool_maxsize={pool_maxsize})")
+    return session
@@ -0,0 +1,53 @@
+import os
+import json
+import logging
+import functools
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def read_json(path: Path) -> Any:
+    """
+    Read and parse a JSON file.
+
+    Uses orjson when it is installed, which decodes several times faster than the
+    standard library, and falls back to json otherwise.
+
+    Args:
+        path: JSON file to read
+
+    Returns:
+        Parsed JSON data
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def read_json_cached(path: Path) -> Any:
+    """
+    Read and parse a JSON file, reusing the parsed data while the file is unchanged.
+
+    Entries are keyed on the file's path, modification time and size, so a
+    rewritten file is parsed again. The returned data is shared between callers
+    and must not be modified.
+
+    Args:
+        path: JSON file to read
+
+    Returns:
+        Parsed JSON data
+    """
+    stat = os.stat(path)
+    return _read_json_cached(str(path), stat.st_mtime_ns, stat.st_size)
+
+@functools.lru_cache(maxsize=256)
+def _read_json_cached(path: str, mtime_ns: int, size: int) -> Any:
+    return read_json(path)
@@ -0,0 +1,142 @@
+import sys
+import os
+import hashlib
+import io
+
+import pytest
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.models.article import Article, _ARXIV_URL_RE
+
+
+def make_article() -> Article:
+    return Article("test-id", "Test Paper", "https://arxiv.org/abs/2310.02207")
+
+
+def test_get_figure_label():
+    article = make_article()
+    article.figures = {
+        "fig_0_1_fig1": None,
+        "fig_0_2_tab1": None,
+        "fig_0_3_unk": None,
+    }
+
+    assert article.get_figure_label("1") == "fig1"
+    assert article.get_figure_label("2") == "tab1"
+    assert article.get_figure_label(3) == "unk"
+    assert article.get_figure_label("4") is None
+
+
+def test_get_figure_label_ignores_unlabelled_figures():
+    article = make_article()
+    article.figures = {"fig_0_1_raw": None, "fig_0_1_fig1": None}
+
+    assert article.get_figure_label("1") == "fig1"
+
+
+def test_get_figure_label_updates_when_figures_replaced():
+    article = make_article()
+    article.figures = {"fig_0_1_fig1": None}
+    article.figures = {"fig_0_2_fig2": None}
+
+    assert article.get_figure_label("1") is None
+    assert article.get_figure_label("2") == "fig2"
+
+
+def test_article_rejects_unknown_attributes():
+    article = make_article()
+    article.body_pdf_path = None
+
+    with pytest.raises(AttributeError):
+        article.unknown_field = 1
+
+
+@pytest.mark.parametrize("url, arxiv_id", [
+    ("https://arxiv.org/abs/2310.02207", "2310.02207"),
+    ("https://arxiv.org/abs/2310.02207v2", "2310.02207v2"),
+    ("https://arxiv.org/pdf/2310.02207.pdf", "2310.02207"),
+    ("http://arxiv.org/abs/hep-th/9901001/", "hep-th/9901001"),
+    ("https://arxiv.org/abs/2310.02207?context=cs", "2310.02207"),
+])
+def test_arxiv_url_id(url, arxiv_id):
+    assert _ARXIV_URL_RE.search(url).group(1) == arxiv_id
+
+
+def test_get_pdf_sha256_reuses_recorded_digest(tmp_path):
+    article = make_article()
+    pdf_path = tmp_path / "paper.pdf"
+    article.set_data_paths(tmp_path, pdf_path)
+    assert article.get_pdf_sha256() is None
+
+    pdf_path.write_bytes(b"%PDF-1.4 test")
+    digest = hashlib.sha256(b"%PDF-1.4 test").hexdigest()
+    assert article.get_pdf_sha256() == digest
+    assert (tmp_path / "paper.pdf.sha256").read_text() == digest
+
+    # A stale digest is recomputed once the PDF is newer
+    (tmp_path / "paper.pdf.sha256").write_text("stale")
+    os.utime(pdf_path, ns=(pdf_path.stat().st_atime_ns, pdf_path.stat().st_mtime_ns + 10**9))
+    assert article.get_pdf_sha256() == digest
+
+
+class FakeResponse:
+    def __init__(self, status_code, raw):
+        self.status_code = status_code
+        self.raw = raw
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+
+    def get(self, url, **kwargs):
+        return self.response
+
+
+class FailingStream(io.BytesIO):
+    def read(self, size=-1):
+        data = super().read(4)
+        if not data:
+            raise IOError("connection reset")
+        return data
+
+
+def test_download_pdf_writes_pdf_and_digest(tmp_path):
+    article = make_article()
+    article.set_data_paths(tmp_path, tmp_path / "paper.pdf")
+    response = FakeResponse(200, io.BytesIO(b"%PDF-1.4 test"))
+
+    assert article.download_pdf(session=FakeSession(response))
+    assert response.closed
+    assert (tmp_path / "paper.pdf").read_bytes() == b"%PDF-1.4 test"
+    assert article.get_pdf_sha256() == hashlib.sha256(b"%PDF-1.4 test").hexdigest()
+
+
+def test_download_pdf_closes_failed_response(tmp_path):
+    article = make_article()
+    article.set_data_paths(tmp_path, tmp_path / "paper.pdf")
+    response = FakeResponse(404, io.BytesIO())
+
+    assert not article.download_pdf(session=FakeSession(response))
+    assert response.closed
+    assert not (tmp_path / "paper.pdf").exists()
+
+
+def test_download_pdf_leaves_no_partial_file(tmp_path):
+    article = make_article()
+    article.set_data_paths(tmp_path, tmp_path / "paper.pdf")
+    response = FakeResponse(200, FailingStream(b"%PDF-1.4 truncated"))
+
+    assert not article.download_pdf(session=FakeSession(response))
+    assert response.closed
+    assert list(tmp_path.iterdir()) == []
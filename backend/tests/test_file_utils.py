@@ -0,0 +1,114 @@
+import sys
+import os
+import hashlib
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.utils.file_utils import file_sha256, link_or_copy, write_bytes_atomic
+
+
+def test_link_or_copy_links_file(tmp_path):
+    src = tmp_path / "fig1.png"
+    src.write_bytes(b"image")
+
+    dst = link_or_copy(src, tmp_path / "thumbnail.png")
+
+    assert dst.read_bytes() == b"image"
+    assert os.path.samefile(src, dst)
+
+
+def test_link_or_copy_replaces_destination_without_touching_old_source(tmp_path):
+    first = tmp_path / "fig1.png"
+    second = tmp_path / "fig2.png"
+    first.write_bytes(b"first")
+    second.write_bytes(b"second")
+    dst = tmp_path / "thumbnail.png"
+
+    link_or_copy(first, dst)
+    link_or_copy(second, dst)
+
+    assert dst.read_bytes() == b"second"
+    assert first.read_bytes() == b"first"
+
+
+def test_link_or_copy_same_file(tmp_path):
+    src = tmp_path / "fig1.png"
+    src.write_bytes(b"image")
+
+    link_or_copy(src, src)
+
+    assert src.read_bytes() == b"image"
+
+
+def test_file_sha256_matches_hashlib(tmp_path):
+    path = tmp_path / "paper.pdf"
+    path.write_bytes(b"%PDF" * 1000)
+
+    assert file_sha256(path, chunk_size=7) == hashlib.sha256(b"%PDF" * 1000).hexdigest()
+
+
+def test_link_or_copy_copies_when_link_fails(tmp_path, monkeypatch):
+    src = tmp_path / "fig1.png"
+    src.write_bytes(b"image")
+
+    def fail_link(src, dst):
+        raise OSError("cross-device link")
+
+    monkeypatch.setattr(os, "link", fail_link)
+    dst = link_or_copy(src, tmp_path / "thumbnail.png")
+
+    assert dst.read_bytes() == b"image"
+    assert not os.path.samefile(src, dst)
+
+
+def test_link_or_copy_keeps_up_to_date_copy(tmp_path):
+    src = tmp_path / "fig1.png"
+    src.write_bytes(b"image")
+    dst = tmp_path / "thumbnail.png"
+    dst.write_bytes(b"image")
+    os.utime(src, (1, 1))
+
+    link_or_copy(src, dst)
+
+    assert not os.path.samefile(src, dst)
+
+
+def test_link_or_copy_replaces_stale_copy(tmp_path):
+    src = tmp_path / "fig1.png"
+    src.write_bytes(b"new image")
+    dst = tmp_path / "thumbnail.png"
+    dst.write_bytes(b"old")
+
+    link_or_copy(src, dst)
+
+    assert dst.read_bytes() == b"new image"
+
+
+def test_link_or_copy_replaces_link_to_previous_source(tmp_path):
+    old_src = tmp_path / "fig1.png"
+    old_src.write_bytes(b"image 1")
+    new_src = tmp_path / "fig2.png"
+    new_src.write_bytes(b"image 2")
+    os.utime(old_src, (1, 1))
+    os.utime(new_src, (1, 1))
+    dst = link_or_copy(old_src, tmp_path / "thumbnail.png")
+
+    # Same size and mtime as the new source, but still a link to the old one
+    link_or_copy(new_src, dst)
+
+    assert dst.read_bytes() == b"image 2"
+    assert old_src.read_bytes() == b"image 1"
+
+
+def test_write_bytes_atomic_does_not_write_through_links(tmp_path):
+    figure = tmp_path / "fig1.png"
+    figure.write_bytes(b"original")
+    post_copy = link_or_copy(figure, tmp_path / "thumbnail.png")
+
+    write_bytes_atomic(figure, b"re-extracted")
+
+    assert figure.read_bytes() == b"re-extracted"
+    assert post_copy.read_bytes() == b"original"
+    assert not (tmp_path / "fig1.png.tmp").exists()
@@ -0,0 +1,27 @@
+import sys
+import os
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.utils.json_utils import read_json, read_json_cached
+
+
+def test_read_json(tmp_path):
+    path = tmp_path / "summary.json"
+    path.write_text('{"summary": "Caf\\u00e9", "display_figures": ["1"]}', encoding="utf-8")
+
+    assert read_json(path) == {"summary": "Café", "display_figures": ["1"]}
+
+
+def test_read_json_cached_reuses_data_until_file_changes(tmp_path):
+    path = tmp_path / "figures_metadata.json"
+    path.write_text('{"fig1": {"caption": "A"}}', encoding="utf-8")
+
+    first = read_json_cached(path)
+    assert read_json_cached(path) is first
+
+    path.write_text('{"fig1": {"caption": "Changed"}}', encoding="utf-8")
+
+    assert read_json_cached(path) == {"fig1": {"caption": "Changed"}}
@@ -126,5 +126,10 @@ def test_latex_parsing():
         logger.error(f"Error during test: {e}")
         raise
 
+def test_clean_latex_rewrites_commands():
+    """Test the LaTeX command and spacing fixes applied by clean_latex."""
+    text = r"\bm{x} + \1m{y} at subscripti} and superscript2} via \operatorname*{argmax}  $$z$$"
+    assert clean_latex(text) == r"\mathbf{x} + \mathbf{y} at _{i} and ^{2} via \operatorname{argmax} $$ z $$ "
+
 if __name__ == "__main__":
     test_latex_parsing() 
\ No newline at end of file
@@ -0,0 +1,90 @@
+import sys
+import os
+import json
+from types import SimpleNamespace
+
+# Add the backend and repository roots to the Python path
+backend_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, backend_root)
+sys.path.insert(0, os.path.dirname(backend_root))
+
+from src.main import plan_summary, summary_matches_pdf
+from src.models.article import Article
+
+
+def make_article(tmp_path, pdf_bytes=b"%PDF-1.4 current") -> Article:
+    article = Article("test-id", "Test Paper", "https://arxiv.org/abs/2310.02207")
+    article.set_data_paths(tmp_path, tmp_path / "paper.pdf")
+    article.pdf_path.write_bytes(pdf_bytes)
+    return article
+
+
+def write_summary(tmp_path, pdf_sha256=None):
+    summary_path = tmp_path / "summary.json"
+    summary_data = {'summary': 'Summary', 'display_figures': []}
+    if pdf_sha256 is not None:
+        summary_data['pdf_sha256'] = pdf_sha256
+    summary_path.write_text(json.dumps(summary_data))
+    return summary_path
+
+
+def make_args(reprocess=None, force_summary=False):
+    return SimpleNamespace(reprocess=reprocess, force_summary=force_summary)
+
+
+def test_summary_matches_pdf(tmp_path):
+    article = make_article(tmp_path)
+
+    assert summary_matches_pdf(write_summary(tmp_path, article.get_pdf_sha256()), article) is True
+    assert summary_matches_pdf(write_summary(tmp_path, "0" * 64), article) is False
+    assert summary_matches_pdf(write_summary(tmp_path), article) is None
+
+
+def test_summary_matches_pdf_unreadable_summary(tmp_path):
+    article = make_article(tmp_path)
+    summary_path = tmp_path / "summary.json"
+    summary_path.write_text("not json")
+
+    assert summary_matches_pdf(summary_path, article) is None
+
+
+def test_plan_summary_without_saved_summary(tmp_path):
+    article = make_article(tmp_path)
+
+    assert plan_summary(tmp_path / "summary.json", article, make_args()) == (True, False)
+
+
+def test_plan_summary_keeps_saved_summary_without_reprocess(tmp_path):
+    article = make_article(tmp_path)
+    summary_path = write_summary(tmp_path, "0" * 64)
+
+    assert plan_summary(summary_path, article, make_args()) == (False, False)
+
+
+def test_plan_summary_reuses_summary_of_unchanged_pdf(tmp_path):
+    article = make_article(tmp_path)
+    summary_path = write_summary(tmp_path, article.get_pdf_sha256())
+
+    assert plan_summary(summary_path, article, make_args('summary')) == (False, False)
+
+
+def test_plan_summary_regenerates_when_pdf_changed(tmp_path):
+    article = make_article(tmp_path)
+    summary_path = write_summary(tmp_path, "0" * 64)
+
+    assert plan_summary(summary_path, article, make_args('all')) == (True, True)
+
+
+def test_plan_summary_without_recorded_hash_uses_stored_summary(tmp_path):
+    article = make_article(tmp_path)
+    summary_path = write_summary(tmp_path)
+
+    assert plan_summary(summary_path, article, make_args('summary')) == (True, False)
+
+
+def test_plan_summary_force(tmp_path):
+    article = make_article(tmp_path)
+    summary_path = write_summary(tmp_path, article.get_pdf_sha256())
+
+    assert plan_summary(summary_path, article, make_args('summary', force_summary=True)) == (True, True)
+    assert plan_summary(tmp_path / "missing.json", article, make_args(force_summary=True)) == (True, True)
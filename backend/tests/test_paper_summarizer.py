@@ -128,5 +128,52 @@ class TestPaperSummarizer(unittest.TestCase):
         self.assertIsNone(thumbnail)
         self.assertEqual(figures, [])
 
+class TestSummarizeMany(unittest.TestCase):
+    def setUp(self):
+        self.summarizer = PaperSummarizer(db=Mock())
+        self.articles = [Article(f"paper-{i}", f"Paper {i}", f"https://arxiv.org/abs/2310.0000{i}") for i in range(3)]
+
+    def test_summarize_many_maps_results_to_articles(self):
+        """Each paper's summary is returned under its own uid."""
+        with patch.object(PaperSummarizer, 'summarize',
+                          side_effect=lambda article, ignore_existing_summary: (f"Summary of {article.uid}", [], None)) as mock_summarize:
+            results = self.summarizer.summarize_many(self.articles, max_workers=2)
+
+        self.assertEqual(mock_summarize.call_count, 3)
+        self.assertEqual(results, {article.uid: (f"Summary of {article.uid}", [], None) for article in self.articles})
+
+    def test_summarize_many_single_article(self):
+        """A single paper goes through summarize() like any other."""
+        with patch.object(PaperSummarizer, 'summarize', return_value=("Summary", ["1"], "1")) as mock_summarize:
+            results = self.summarizer.summarize_many(self.articles[:1], ignore_existing_summary=True)
+
+        mock_summarize.assert_called_once_with(self.articles[0], ignore_existing_summary=True)
+        self.assertEqual(results, {"paper-0": ("Summary", ["1"], "1")})
+
+    def test_summarize_many_regenerates_selected_papers(self):
+        """Only papers listed in regenerate_uids skip their existing summary."""
+        with patch.object(PaperSummarizer, 'summarize', return_value=("Summary", [], None)) as mock_summarize:
+            self.summarizer.summarize_many(self.articles, regenerate_uids={"paper-1"})
+
+        ignored = {call.args[0].uid: call.kwargs['ignore_existing_summary'] for call in mock_summarize.call_args_list}
+        self.assertEqual(ignored, {"paper-0": False, "paper-1": True, "paper-2": False})
+
+    def test_summarize_many_omits_failed_papers(self):
+        """A paper whose model call raises is left out without affecting the others."""
+        def summarize(article, ignore_existing_summary):
+            if article.uid == "paper-1":
+                raise ValueError("Failed to generate summary: empty model response")
+            return ("Summary", [], None)
+
+        with patch.object(PaperSummarizer, 'summarize', side_effect=summarize):
+            results = self.summarizer.summarize_many(self.articles)
+
+        self.assertEqual(set(results), {"paper-0", "paper-2"})
+
+    def test_summarize_many_empty(self):
+        with patch.object(PaperSummarizer, 'summarize') as mock_summarize:
+            self.assertEqual(self.summarizer.summarize_many([]), {})
+        mock_summarize.assert_not_called()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
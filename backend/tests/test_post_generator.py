@@ -0,0 +1,94 @@
+import sys
+import os
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import yaml
+
+# Add the backend and repository roots to the Python path
+backend_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, backend_root)
+sys.path.insert(0, os.path.dirname(backend_root))
+
+from backend.src.markdown.post_generator import (
+    create_post_markdown,
+    escape_caption,
+    format_caption,
+    generate_figure_markdown,
+    process_figure_references,
+)
+from backend.src.models.figure import Figure
+
+
+def test_escape_caption_escapes_shortcode_characters():
+    assert escape_caption("Plain caption") == "Plain caption"
+    assert escape_caption('Say "hi"\nto `x` at $5') == "Say 'hi' to \\\\`x\\\\` at \\$5"
+
+
+def test_format_caption_numbers_figures_and_tables():
+    assert format_caption("fig2", "A caption") == "**Figure 2:** A caption"
+    assert format_caption("appendix_tab1", "Results") == "**Table A1:** Results"
+    assert format_caption("fig3", "Sub", True, "b") == "(b)"
+
+
+def test_generate_figure_markdown_finds_subfigure_ignoring_case():
+    figure = Figure("fig3", "Main", has_subfigures=True,
+                    subfigures=[{"id": "a", "caption": "Left"}, {"id": "B", "caption": "Right"}])
+
+    assert generate_figure_markdown(figure, "fig3", "b") == '{{< figure src="fig3_B.png" caption="(B)" >}}'
+    assert generate_figure_markdown(figure, "fig3", "c") == ""
+
+
+class FakeFigure:
+    caption = "A plot"
+    has_subfigures = False
+    subfigures = []
+
+
+class FakePost:
+    def get_figure(self, figure_id):
+        return FakeFigure() if figure_id == "fig1" else None
+
+
+def test_process_figure_references_inserts_each_figure_once():
+    markdown = "See <FIGURE_ID>1</FIGURE_ID>.\nAgain <FIGURE_ID>1</FIGURE_ID> and <FIGURE_ID>2.B</FIGURE_ID>.\nEnd"
+
+    result = process_figure_references(markdown, FakePost())
+
+    assert result == (
+        "See Figure 1.\n"
+        "\n"
+        '{{< figure src="fig1.png" caption="**Figure 1:** A plot" >}}\n'
+        "\n"
+        "Again Figure 1 and Figure 2.B.\n"
+        "End"
+    )
+
+
+def test_create_post_markdown_frontmatter_is_valid_yaml():
+    article = SimpleNamespace(
+        uid="abc",
+        title='A "tricky": title \\ with 1. numbers',
+        url="https://arxiv.org/abs/2310.02207",
+        authors=[" Ada Lovelace ", "Alan Turing"],
+        abstract="Line one.\n\n\nLine two with 1. a list",
+        tldr="Short",
+        venue="",
+        submitted_date=datetime(2024, 3, 1),
+        tags=["interp"],
+        highlight=True,
+    )
+    post = SimpleNamespace(article=article, summary="# Paper Summary\n\nBody", post_dir=None)
+
+    markdown = create_post_markdown(post, today=date(2025, 1, 2))
+    _, frontmatter, body = markdown.split("---\n", 2)
+    data = yaml.safe_load(frontmatter)
+
+    assert data["title"] == article.title
+    assert data["abstract"] == article.abstract
+    assert data["authors"] == ["Ada Lovelace", "Alan Turing"]
+    assert data["publication_date"] == datetime(2024, 3, 1).date()
+    assert data["tags"] == ["interp"]
+    assert data["highlight"] is True
+    assert data["date"] == data["added_date"] == date(2025, 1, 2)
+    assert "Body" in body
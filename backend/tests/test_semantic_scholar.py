@@ -0,0 +1,49 @@
+import sys
+import os
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.api.semantic_scholar import SemanticScholarAPI
+
+
+def test_fetch_paper_details_batch_maps_ids_across_chunks(monkeypatch):
+    api = SemanticScholarAPI()
+    monkeypatch.setattr(api, 'MAX_BATCH_SIZE', 2)
+    requests_made = []
+
+    def make_request(method, endpoint, **kwargs):
+        ids = kwargs['json']['ids']
+        requests_made.append(ids)
+        # The batch endpoint answers in request order, with None for unknown IDs
+        return [None if paper_id == 'unknown' else {'paperId': paper_id} for paper_id in ids]
+
+    monkeypatch.setattr(api, '_make_request', make_request)
+    paper_ids = ['p1', 'p2', 'unknown', 'p4', 'p5']
+
+    # Mapped back to the requested IDs the same way process_flagged_papers does
+    refreshed_info = dict(zip(paper_ids, api.fetch_paper_details_batch(paper_ids)))
+
+    assert requests_made == [['p1', 'p2'], ['unknown', 'p4'], ['p5']]
+    assert refreshed_info == {
+        'p1': {'paperId': 'p1'},
+        'p2': {'paperId': 'p2'},
+        'unknown': None,
+        'p4': {'paperId': 'p4'},
+        'p5': {'paperId': 'p5'},
+    }
+
+
+def test_fetch_paper_details_batch_single_chunk(monkeypatch):
+    api = SemanticScholarAPI()
+    calls = []
+
+    def make_request(method, endpoint, **kwargs):
+        calls.append(kwargs['json']['ids'])
+        return [{'paperId': 'p1'}]
+
+    monkeypatch.setattr(api, '_make_request', make_request)
+
+    assert api.fetch_paper_details_batch(['p1']) == [{'paperId': 'p1'}]
+    assert calls == [['p1']]
@@ -0,0 +1,102 @@
+import sys
+import os
+import logging
+from unittest.mock import MagicMock
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.models.supabase import SupabaseDB
+
+
+def make_db() -> SupabaseDB:
+    """SupabaseDB with a mocked client, skipping the credential and R2 setup in __init__."""
+    db = SupabaseDB.__new__(SupabaseDB)
+    db.logger = logging.getLogger("test_supabase")
+    db.client = MagicMock()
+    db._paper_ids_cache = None
+    return db
+
+
+def test_paper_to_row_fills_defaults():
+    row = make_db()._paper_to_row({'id': 'p1', 'title': 'Paper', 'tldr': {'text': 'Short version'}})
+
+    assert row['id'] == 'p1'
+    assert row['title'] == 'Paper'
+    assert row['tldr'] == 'Short version'
+    assert row['authors'] == []
+    assert row['include_on_website'] is False
+    assert row['appendix_page_number'] is None
+
+
+def test_paper_to_row_keeps_plain_tldr():
+    assert make_db()._paper_to_row({'id': 'p1', 'tldr': 'Short version'})['tldr'] == 'Short version'
+
+
+def test_add_papers_upserts_in_one_request():
+    db = make_db()
+    table = db.client.table.return_value
+    table.upsert.return_value.execute.return_value.data = [{'id': 'p1'}, {'id': 'p2'}]
+
+    assert db.add_papers([{'id': 'p1'}, {'id': 'p2'}]) == 2
+
+    rows = table.upsert.call_args.args[0]
+    assert [row['id'] for row in rows] == ['p1', 'p2']
+    assert table.upsert.call_args.kwargs == {'on_conflict': 'id', 'ignore_duplicates': True}
+
+
+def test_add_papers_empty():
+    db = make_db()
+
+    assert db.add_papers([]) == 0
+    db.client.table.assert_not_called()
+
+
+def test_add_papers_falls_back_to_individual_inserts():
+    db = make_db()
+    db.client.table.return_value.upsert.return_value.execute.side_effect = Exception("invalid input syntax")
+    db.add_paper = MagicMock(side_effect=[{'id': 'p1'}, Exception("invalid input syntax"), {'id': 'p3'}])
+    papers = [{'id': 'p1'}, {'id': 'bad'}, {'id': 'p3'}]
+
+    assert db.add_papers(papers) == 2
+    assert [call.args[0] for call in db.add_paper.call_args_list] == papers
+
+
+def test_get_paper_ids_is_cached():
+    db = make_db()
+    db.client.table.return_value.select.return_value.execute.return_value.data = [{'id': 'p1'}, {'id': 'p2'}]
+
+    assert db.get_paper_ids() == {'p1', 'p2'}
+    assert db.get_paper_ids() == {'p1', 'p2'}
+    assert db.client.table.return_value.select.return_value.execute.call_count == 1
+
+
+def test_remember_paper_ids_updates_loaded_cache():
+    db = make_db()
+    db.client.table.return_value.select.return_value.execute.return_value.data = [{'id': 'p1'}]
+    db.get_paper_ids()
+
+    db._remember_paper_ids(['p2'])
+
+    assert db.get_paper_ids() == {'p1', 'p2'}
+
+
+def test_remember_paper_ids_before_load_is_ignored():
+    db = make_db()
+    db._remember_paper_ids(['p2'])
+
+    assert db._paper_ids_cache is None
+
+
+def test_refresh_paper_ids_refetches():
+    db = make_db()
+    execute = db.client.table.return_value.select.return_value.execute
+    execute.return_value.data = [{'id': 'p1'}]
+    db.get_paper_ids()
+
+    execute.return_value.data = [{'id': 'p1'}, {'id': 'p2'}]
+    db.refresh_paper_ids()
+
+    assert db.get_paper_ids() == {'p1', 'p2'}
+    assert execute.call_count == 2